@@ -1,11 +1,24 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
+import functools
+import gzip
+import hashlib
 import io
+import json
 import re
 import requests
+from requests.adapters import HTTPAdapter
 import base64
-from typing import Tuple, Optional, List, Dict
+import os
+import random
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+import pyarrow.feather as feather
+from typing import BinaryIO, Callable, NamedTuple, Tuple, Optional, List, Dict
 
 # ============================================================================
 # CONFIGURATION
@@ -27,11 +40,25 @@ ADMIN_USERNAME = "admin"
 ADMIN_PASSWORD = "admin123"
 ENUMERATOR_PASSWORD = "1234"
 CACHE_TTL = 3600  # 1 hour
+CORRECTIONS_REVALIDATE_SECONDS = 60  # how often other writers' corrections are picked up
+WRITE_COALESCE_SECONDS = 0.2  # how long a save waits for concurrent saves to join its commit
+SNAPSHOT_DIR = ".hfc_snapshot"  # local columnar snapshot of parsed files, for warm restarts
+TOKEN_CHECK_TTL = 300  # seconds a token check result is trusted before a background re-check
+FARMERS_PER_PAGE = 10  # farmers whose correction forms are built per page
+SHARD_FETCH_WORKERS = 8  # concurrent shard downloads (stays under the connection pool size)
+COMPACT_SHARDS_AT = 50  # shard count at which shards are merged into the legacy file
 
 # ========== FILE NAMES ==========
 CONSTRAINTS_FILE = "constraints_papaya.csv"
 LOGIC_FILE = "logic_papaya.csv"
-CORRECTIONS_FILE = "corrections_papaya.csv"
+CORRECTIONS_FILE = "corrections_papaya.csv"  # merged history: legacy rows plus compacted shards
+CORRECTIONS_SHARD_DIR = "corrections_papaya"  # one append-only CSV shard per save
+
+# Error files loaded together by load_data_from_github
+DATA_FILES = [CONSTRAINTS_FILE, LOGIC_FILE]
+
+# Repetitive text columns stored as categoricals when files are parsed
+CATEGORICAL_COLUMNS = ['username', 'variable', 'woreda', 'kebele', 'village', 'error_type', 'corrected_by']
 
 # ========== UPDATED ENUMERATOR LIST (Only 5 enumerators) ==========
 VALID_ENUMERATORS = [
@@ -176,16 +203,58 @@ st.markdown("""
 # SESSION STATE INITIALIZATION
 # ============================================================================
 
+class DraftStore:
+    """Drafted corrections for one session, indexed by error key and farmer.
+
+    A draft references its error row (the enumerator's error frame and the
+    row label) instead of holding a copy, next to the fields the enumerator
+    edited. The farmer index keeps per-farmer lookups proportional to that
+    farmer's drafts.
+    """
+
+    def __init__(self):
+        self._drafts: Dict[str, Dict] = {}
+        self._by_farmer: Dict[str, Dict[str, None]] = {}
+
+    def __len__(self) -> int:
+        return len(self._drafts)
+
+    def get(self, error_key: str) -> Optional[Dict]:
+        return self._drafts.get(error_key)
+
+    def items(self):
+        return self._drafts.items()
+
+    def put(self, error_key: str, draft: Dict):
+        """Add or replace a draft; draft['farmer_id'] must be the stringified farmer ID"""
+        self._drafts[error_key] = draft
+        self._by_farmer.setdefault(draft['farmer_id'], {})[error_key] = None
+
+    def for_farmer(self, farmer_id) -> Dict[str, Dict]:
+        return {error_key: self._drafts[error_key] for error_key in self._by_farmer.get(str(farmer_id), ())}
+
+    def remove(self, error_key: str):
+        draft = self._drafts.pop(error_key, None)
+        if draft is None:
+            return
+
+        farmer_keys = self._by_farmer[draft['farmer_id']]
+        farmer_keys.pop(error_key, None)
+        if not farmer_keys:
+            del self._by_farmer[draft['farmer_id']]
+
 def initialize_session_state():
     """Initialize all session state variables"""
     defaults = {
         'corrected_errors': set(),
-        'all_corrections_data': {},
+        'drafts': DraftStore(),
         'is_admin': False,
         'is_authenticated': False,
         'selected_enumerator': None,
         'show_completed': False,
-        'filter_error_type': 'All'
+        'filter_error_type': 'All',
+        'enumerator_workload': None,
+        'farmer_page': 1
     }
     
     for key, value in defaults.items():
@@ -194,6 +263,965 @@ def initialize_session_state():
 
 initialize_session_state()
 
+# ============================================================================
+# STORAGE BACKENDS
+# ============================================================================
+
+class StorageError(Exception):
+    """Raised when a storage backend cannot complete a request"""
+
+
+class StorageConflict(StorageError):
+    """Raised when a write lost a race with another writer and may be retried"""
+
+
+class StorageBackend(ABC):
+    """Interface for the data store holding the constraint, logic and corrections files"""
+
+    @abstractmethod
+    def open_file(self, filename: str, known_version: Optional[str] = None,
+                  current_version: Optional[str] = None) -> Optional[Tuple[Optional[BinaryIO], str]]:
+        """Return (stream, version) for a file, or None if it does not exist.
+
+        The caller reads the content from the binary stream and closes it.
+        When known_version is still current nothing is transferred and
+        (None, known_version) is returned instead. A caller that has just
+        listed the file passes its listed version as current_version, so
+        the backend need not look it up again.
+        """
+
+    @abstractmethod
+    def write_file(self, filename: str, content: bytes, message: str, version: Optional[str] = None) -> Optional[str]:
+        """Create or replace a file and return its new version, or None on failure.
+
+        When replacing, version must match the stored one; a write that races
+        another writer raises StorageConflict. Repeating a create whose
+        content already landed returns the stored version, so a write whose
+        outcome is unknown (StorageError) can safely be retried.
+        """
+
+    @abstractmethod
+    def replace_files(self, filename: str, content: bytes, version: Optional[str],
+                      removed: Dict[str, str], message: str) -> Optional[str]:
+        """Write a file and delete others ({path: version}) as one change.
+
+        Returns the file's new version, or None on failure. Raises
+        StorageConflict if any of the files changed in the meantime.
+        """
+
+    @abstractmethod
+    def list_files(self, directory: str) -> Dict[str, str]:
+        """Return {name: version} for the files directly inside a directory"""
+
+    def check_access(self) -> bool:
+        """Verify the backend is reachable with the configured credentials"""
+        return True
+
+    def set_unauthorized_handler(self, handler: Callable[[], None]):
+        """Register a callback for requests rejected as unauthorized"""
+
+
+class GitHubClient:
+    """Shared GitHub API client with pooled keep-alive connections and retries.
+
+    Requests get bounded (connect, read) timeouts and are retried with
+    full-jitter exponential backoff on secondary rate limits and, for
+    idempotent methods only, on connection errors and 5xx responses: a
+    timed-out PUT may still have been committed. Primary rate-limit exhaustion is returned
+    as-is since its reset can be up to an hour away, and so is a
+    Retry-After longer than max_retry_after; shorter ones are honoured in
+    full.
+    """
+
+    RETRY_STATUSES = {500, 502, 503, 504}
+    IDEMPOTENT_METHODS = {"GET", "HEAD"}
+
+    def __init__(self, pool_size: int = 10, max_retries: int = 3, backoff: float = 0.5,
+                 max_backoff: float = 8.0, max_retry_after: float = 60.0,
+                 timeout: Tuple[float, float] = (3.05, 10)):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.timeout = timeout
+        # Called on any 401, so a revoked token is noticed without a /user check
+        self.on_unauthorized: Optional[Callable[[], None]] = None
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+
+    def _backoff_delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def _retry_delay(self, response: requests.Response, attempt: int, idempotent: bool) -> Optional[float]:
+        """Seconds to wait before retrying a response, or None if it should not be retried"""
+        if response.status_code in self.RETRY_STATUSES:
+            return self._backoff_delay(attempt) if idempotent else None
+
+        if response.status_code in [403, 429]:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                # Retrying sooner than asked only earns another rejection
+                delay = float(retry_after)
+                return delay if delay <= self.max_retry_after else None
+            if response.headers.get("X-RateLimit-Remaining") == "0":
+                return None
+            if "secondary rate limit" in response.text.lower():
+                return self._backoff_delay(attempt)
+
+        return None
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send an authenticated request, retrying transient failures"""
+        headers = get_github_headers()
+        headers.update(kwargs.pop("headers", {}))
+        kwargs.setdefault("timeout", self.timeout)
+        idempotent = method in self.IDEMPOTENT_METHODS
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.request(method, url, headers=headers, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if not idempotent or attempt == self.max_retries:
+                    raise
+                time.sleep(self._backoff_delay(attempt))
+                continue
+
+            if response.status_code == 401 and self.on_unauthorized is not None:
+                self.on_unauthorized()
+
+            delay = self._retry_delay(response, attempt, idempotent)
+            if delay is None or attempt == self.max_retries:
+                return response
+            time.sleep(delay)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> requests.Response:
+        return self.request("PUT", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def patch(self, url: str, **kwargs) -> requests.Response:
+        return self.request("PATCH", url, **kwargs)
+
+
+class GitHubStorage(StorageBackend):
+    """Files stored in a GitHub repository.
+
+    Files are versioned by blob sha, resolved from a conditional listing of
+    their directory, and downloaded as raw streams through the blobs API,
+    which (unlike inlined Contents API responses) works up to 100 MB.
+    """
+
+    def __init__(self, owner: str, repo: str, branch: str = "main", client: Optional[GitHubClient] = None):
+        self.owner = owner
+        self.repo = repo
+        self.branch = branch
+        self.client = client or GitHubClient()
+        # url -> (ETag, listing) for directory listings
+        self._listings: Dict[str, Tuple[str, Dict[str, str]]] = {}
+
+    def _url(self, filename: str) -> str:
+        return f"https://api.github.com/repos/{self.owner}/{self.repo}/contents/{filename}"
+
+    @staticmethod
+    def _blob_sha(content: bytes) -> str:
+        """The sha git assigns to a blob with this content"""
+        return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+    def open_file(self, filename: str, known_version: Optional[str] = None,
+                  current_version: Optional[str] = None) -> Optional[Tuple[Optional[BinaryIO], str]]:
+        directory, _, name = filename.rpartition('/')
+        sha = current_version or self.list_files(directory).get(name)
+
+        if sha is None:
+            return None
+        if sha == known_version:
+            return None, sha
+
+        response = self.client.get(
+            f"https://api.github.com/repos/{self.owner}/{self.repo}/git/blobs/{sha}",
+            headers={"Accept": "application/vnd.github.raw"},
+            stream=True
+        )
+
+        if response.status_code != 200:
+            response.close()
+            raise StorageError(f"{response.status_code}")
+
+        response.raw.decode_content = True
+        return response.raw, sha
+
+    def write_file(self, filename: str, content: bytes, message: str, version: Optional[str] = None) -> Optional[str]:
+        payload = {
+            "message": message,
+            "content": base64.b64encode(content).decode(),
+            "branch": self.branch
+        }
+
+        if version:
+            payload["sha"] = version
+
+        try:
+            response = self.client.put(self._url(filename), json=payload)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            raise StorageError(str(e)) from e
+
+        if response.status_code == 422 and not version:
+            # The file exists: either an earlier attempt at this create landed or a real clash
+            directory, _, name = filename.rpartition('/')
+            sha = self.list_files(directory).get(name)
+            if sha == self._blob_sha(content):
+                return sha
+
+        # 409: the branch moved under a concurrent commit; 422: sha mismatch
+        if response.status_code in [409, 422]:
+            raise StorageConflict(f"{response.status_code}")
+        if response.status_code in self.client.RETRY_STATUSES:
+            # The commit may or may not have landed
+            raise StorageError(f"{response.status_code}")
+        if response.status_code not in [200, 201]:
+            return None
+        return response.json()['content']['sha']
+
+    def replace_files(self, filename: str, content: bytes, version: Optional[str],
+                      removed: Dict[str, str], message: str) -> Optional[str]:
+        # The Contents API commits one file at a time, so build the commit
+        # through the Git Data API and move the branch only if nobody else did
+        api = f"https://api.github.com/repos/{self.owner}/{self.repo}/git"
+
+        response = self.client.get(f"{api}/ref/heads/{self.branch}")
+        if response.status_code != 200:
+            return None
+        parent = response.json()['object']['sha']
+
+        expected = dict(removed)
+        expected[filename] = version
+        for path, path_version in expected.items():
+            directory, _, name = path.rpartition('/')
+            if self.list_files(directory).get(name) != path_version:
+                raise StorageConflict(f"{path} changed")
+
+        response = self.client.get(f"{api}/commits/{parent}")
+        if response.status_code != 200:
+            return None
+
+        entries = [{"path": filename, "mode": "100644", "type": "blob", "content": content.decode()}]
+        entries.extend({"path": path, "mode": "100644", "type": "blob", "sha": None} for path in removed)
+        response = self.client.post(f"{api}/trees", json={"base_tree": response.json()['tree']['sha'], "tree": entries})
+        if response.status_code != 201:
+            return None
+
+        response = self.client.post(f"{api}/commits", json={
+            "message": message, "tree": response.json()['sha'], "parents": [parent]
+        })
+        if response.status_code != 201:
+            return None
+
+        # Not forced: a branch that moved since we read it is rejected with 422
+        response = self.client.patch(f"{api}/refs/heads/{self.branch}", json={"sha": response.json()['sha']})
+        if response.status_code == 422:
+            raise StorageConflict("422")
+        if response.status_code != 200:
+            return None
+        return self._blob_sha(content)
+
+    def list_files(self, directory: str) -> Dict[str, str]:
+        # The trees API is not capped at 1000 entries like a Contents API listing
+        tree = f"{self.branch}:{directory}" if directory else self.branch
+        url = f"https://api.github.com/repos/{self.owner}/{self.repo}/git/trees/{tree}"
+        headers = {}
+
+        cached = self._listings.get(url)
+        if cached:
+            headers["If-None-Match"] = cached[0]
+
+        response = self.client.get(url, headers=headers)
+
+        if response.status_code == 304:
+            return dict(cached[1])
+        if response.status_code == 404:
+            return {}
+        if response.status_code != 200:
+            raise StorageError(f"{response.status_code}")
+
+        listing = {
+            entry['path']: entry['sha']
+            for entry in response.json().get('tree', [])
+            if entry.get('type') == 'blob'
+        }
+        if response.headers.get("ETag"):
+            self._listings[url] = (response.headers["ETag"], listing)
+
+        return dict(listing)
+
+    def check_access(self) -> bool:
+        response = self.client.get("https://api.github.com/user", timeout=(3.05, 5))
+        return response.status_code != 401
+
+    def set_unauthorized_handler(self, handler: Callable[[], None]):
+        self.client.on_unauthorized = handler
+
+
+class LocalStorage(StorageBackend):
+    """Files stored in a local directory, for running next to a local data store or offline"""
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.root, filename)
+
+    @staticmethod
+    def _version(path: str) -> str:
+        stat = os.stat(path)
+        return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+    def open_file(self, filename: str, known_version: Optional[str] = None,
+                  current_version: Optional[str] = None) -> Optional[Tuple[Optional[BinaryIO], str]]:
+        # A stat is as cheap as trusting current_version, and always accurate
+        path = self._path(filename)
+        if not os.path.exists(path):
+            return None
+
+        version = self._version(path)
+        if version == known_version:
+            return None, version
+
+        return open(path, 'rb'), version
+
+    def write_file(self, filename: str, content: bytes, message: str, version: Optional[str] = None) -> Optional[str]:
+        path = self._path(filename)
+
+        # Mirror GitHub's sha check so concurrent writers cannot overwrite each other
+        if os.path.exists(path) and self._version(path) != version:
+            if version is None:
+                with open(path, 'rb') as f:
+                    if f.read() == content:
+                        return self._version(path)
+            raise StorageConflict(f"{filename} changed")
+
+        os.makedirs(os.path.dirname(path) or self.root, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        return self._version(path)
+
+    def replace_files(self, filename: str, content: bytes, version: Optional[str],
+                      removed: Dict[str, str], message: str) -> Optional[str]:
+        for path, path_version in removed.items():
+            if not os.path.exists(self._path(path)) or self._version(self._path(path)) != path_version:
+                raise StorageConflict(f"{path} changed")
+
+        # Local files cannot change together: a reader listing between these
+        # steps sees the merged rows twice until its next refresh
+        new_version = self.write_file(filename, content, message, version)
+        for path in removed:
+            os.remove(self._path(path))
+        return new_version
+
+    def list_files(self, directory: str) -> Dict[str, str]:
+        path = self._path(directory)
+        if not os.path.isdir(path):
+            return {}
+
+        return {
+            name: self._version(os.path.join(path, name))
+            for name in os.listdir(path)
+            if not name.endswith('.tmp') and os.path.isfile(os.path.join(path, name))
+        }
+
+
+def get_storage_config() -> Dict[str, str]:
+    """Read the [storage] section of the secrets, if any"""
+    try:
+        return dict(st.secrets.get("storage", {}))
+    except FileNotFoundError:
+        return {}
+
+@st.cache_resource
+def get_storage() -> StorageBackend:
+    """Create the configured storage backend (GitHub unless [storage] backend = "local")"""
+    config = get_storage_config()
+
+    if config.get("backend", "github") == "local":
+        return LocalStorage(config.get("path", "data"))
+
+    return GitHubStorage(GITHUB_OWNER, GITHUB_REPO, config.get("branch", "main"))
+
+
+def make_arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """Return a copy Arrow can write: one type per column (CSV concatenation can mix them)"""
+    df = df.reset_index(drop=True)
+    for col in df.columns:
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True).startswith('mixed'):
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+
+class SnapshotStore:
+    """Parsed frames persisted to local disk for warm restarts.
+
+    Frames are written as uncompressed Arrow IPC (Feather v2) files, tagged
+    in a manifest with the storage version they were parsed from, and
+    memory-mapped on load. Saving is best-effort: a frame that cannot be
+    written is simply left out of the snapshot.
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name.replace('/', '__') + '.arrow')
+
+    def _read_manifest(self) -> Dict[str, str]:
+        try:
+            with open(os.path.join(self.path, self.MANIFEST)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def load(self, name: str) -> Optional[Tuple[str, pd.DataFrame]]:
+        """Return (version, df) saved under name, or None"""
+        version = self._read_manifest().get(name)
+        if version is None:
+            return None
+
+        try:
+            # pd.read_feather cannot memory-map, so read through pyarrow directly
+            return version, feather.read_table(self._file(name), memory_map=True).to_pandas()
+        except Exception:
+            return None
+
+    def save(self, name: str, version: str, df: pd.DataFrame):
+        """Persist a frame and record its version in the manifest"""
+        try:
+            df = make_arrow_safe(df)
+
+            tmp_path = f"{self._file(name)}.{os.getpid()}.tmp"
+            df.to_feather(tmp_path, compression='uncompressed')
+
+            with self._lock:
+                os.replace(tmp_path, self._file(name))
+                manifest = self._read_manifest()
+                manifest[name] = version
+                manifest_tmp = os.path.join(self.path, f"{self.MANIFEST}.{os.getpid()}.tmp")
+                with open(manifest_tmp, 'w') as f:
+                    json.dump(manifest, f)
+                os.replace(manifest_tmp, os.path.join(self.path, self.MANIFEST))
+        except Exception:
+            pass
+
+@st.cache_resource
+def get_snapshot_store() -> Optional[SnapshotStore]:
+    """Create the on-disk snapshot store ([storage] snapshot_path = "" disables it)"""
+    path = get_storage_config().get("snapshot_path", SNAPSHOT_DIR)
+    return SnapshotStore(path) if path else None
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Store repetitive text columns as categoricals and numbers in the smallest exact dtype"""
+    for col in df.columns:
+        column = df[col]
+        if col in CATEGORICAL_COLUMNS:
+            if not isinstance(column.dtype, pd.CategoricalDtype) and \
+                    pd.api.types.infer_dtype(column, skipna=True) == 'string':
+                df[col] = column.astype('category')
+        elif pd.api.types.is_integer_dtype(column.dtype):
+            df[col] = pd.to_numeric(column, downcast='integer')
+        elif pd.api.types.is_float_dtype(column.dtype):
+            # Only narrow floats that survive the round trip unchanged
+            narrow = column.astype('float32')
+            if narrow.astype(column.dtype).equals(column):
+                df[col] = narrow
+    return df
+
+def concat_frames(frames: List[pd.DataFrame], ignore_index: bool = True) -> pd.DataFrame:
+    """Concatenate compact frames without falling back to object columns"""
+    df = pd.concat(frames, ignore_index=ignore_index)
+    for col in CATEGORICAL_COLUMNS:
+        if col not in df.columns or isinstance(df[col].dtype, pd.CategoricalDtype):
+            continue
+        # pd.concat only keeps categoricals whose categories match exactly
+        parts = [frame[col] for frame in frames if col in frame.columns]
+        if len(parts) == len(frames) and all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            df[col] = pd.api.types.union_categoricals(parts)
+    return df
+
+
+class FrameCache:
+    """Parsed DataFrames kept next to the storage version they were parsed from.
+
+    Reads are conditional on the cached version, so an unchanged file costs
+    a 304 (or nothing, when the caller already knows the current version)
+    instead of a download and a pd.read_csv. Changed files are parsed
+    straight from the storage stream without buffering the raw text, then
+    compacted with compact_frame. Cached frames are shared by all sessions
+    and must not be modified in place.
+
+    Files listed in snapshot_files are persisted to the snapshot store and
+    seeded from it at startup. A seeded frame is served as-is on first use
+    while it is revalidated in the background; on_refresh is called if that
+    finds a newer version.
+    """
+
+    def __init__(self, storage: StorageBackend, snapshot: Optional[SnapshotStore] = None,
+                 snapshot_files: Optional[List[str]] = None, on_refresh=None):
+        self.storage = storage
+        self.snapshot = snapshot
+        self.snapshot_files = set(snapshot_files or [])
+        self.on_refresh = on_refresh
+        self._frames: Dict[str, Tuple[str, pd.DataFrame]] = {}
+        self._unvalidated = set()
+        self._lock = threading.Lock()
+
+        if snapshot is not None:
+            for filename in self.snapshot_files:
+                saved = snapshot.load(filename)
+                if saved is not None:
+                    self._frames[filename] = saved
+                    self._unvalidated.add(filename)
+
+    def get(self, filename: str, known_version: Optional[str] = None) -> Optional[Tuple[pd.DataFrame, str]]:
+        """Return (df, version) for a file, or None if it does not exist"""
+        with self._lock:
+            cached = self._frames.get(filename)
+            from_snapshot = filename in self._unvalidated
+            self._unvalidated.discard(filename)
+
+        if cached is not None and known_version is not None and cached[0] == known_version:
+            return cached[1], cached[0]
+
+        if from_snapshot:
+            threading.Thread(target=self._revalidate, args=(filename, cached), daemon=True).start()
+            return cached[1], cached[0]
+
+        return self._load(filename, cached, known_version)
+
+    def _load(self, filename: str, cached: Optional[Tuple[str, pd.DataFrame]],
+              current_version: Optional[str] = None) -> Optional[Tuple[pd.DataFrame, str]]:
+        opened = self.storage.open_file(filename, cached[0] if cached else None, current_version)
+
+        if opened is None:
+            with self._lock:
+                self._frames.pop(filename, None)
+            return None
+
+        stream, version = opened
+        if stream is None:
+            return cached[1], version
+
+        with stream:
+            df = compact_frame(pd.read_csv(stream))
+        self.put(filename, version, df)
+
+        if self.snapshot is not None and filename in self.snapshot_files:
+            self.snapshot.save(filename, version, df)
+
+        return df, version
+
+    def _revalidate(self, filename: str, cached: Tuple[str, pd.DataFrame]):
+        try:
+            loaded = self._load(filename, cached)
+        except Exception:
+            # Keep serving the snapshot; the next foreground read retries
+            return
+
+        if (loaded is None or loaded[1] != cached[0]) and self.on_refresh is not None:
+            self.on_refresh()
+
+    def put(self, filename: str, version: str, df: pd.DataFrame):
+        """Record a frame whose content is known to match the stored version"""
+        with self._lock:
+            self._frames[filename] = (version, df)
+
+    def discard(self, filenames):
+        """Forget frames for files that no longer exist"""
+        with self._lock:
+            for filename in filenames:
+                self._frames.pop(filename, None)
+
+@st.cache_resource
+def get_frame_cache() -> FrameCache:
+    """Process-wide cache of parsed files, shared by all sessions"""
+    return FrameCache(
+        get_storage(),
+        get_snapshot_store(),
+        DATA_FILES,
+        on_refresh=lambda: load_data_from_github.clear()
+    )
+
+
+class CorrectionsCache:
+    """Merged corrections table shared by all sessions.
+
+    The table is versioned by the (path, sha) pairs of the legacy file and
+    the shards it was built from. Reads within revalidate_seconds of the
+    last check cost no request at all; our own saves update the table in
+    place through add_shard, so they are visible immediately. Refreshes only
+    download shards missing from the table, several at a time.
+
+    Once compact_at shards have accumulated, a background commit merges them
+    into the legacy file and deletes them, so a cold load stays a handful of
+    requests. Other processes then see a new legacy version and reload.
+
+    Saves cost only their own rows: added shards are queued and merged into
+    the table on the next read, and the snapshot is rewritten by a
+    background thread at most once every SNAPSHOT_DELAY seconds.
+
+    With a snapshot store the merged table also survives restarts: the saved
+    copy is served on first use while storage is checked in the background.
+    """
+
+    SNAPSHOT_NAME = "corrections"
+    SNAPSHOT_DELAY = 5.0
+
+    def __init__(self, frame_cache: FrameCache, revalidate_seconds: float,
+                 snapshot: Optional[SnapshotStore] = None, compact_at: Optional[int] = None):
+        self.frame_cache = frame_cache
+        self.revalidate_seconds = revalidate_seconds
+        self.snapshot = snapshot
+        self.compact_at = compact_at
+        self.version: Optional[Tuple[Tuple[str, str], ...]] = None
+        self._df: Optional[pd.DataFrame] = None
+        # Shards added since the table was last merged, oldest first
+        self._tail: List[pd.DataFrame] = []
+        # Never refreshed counts as stale however small the monotonic clock is
+        self._checked_at = float('-inf')
+        self._unvalidated = False
+        self._lock = threading.Lock()
+        # Serializes refreshes and local appends so neither overwrites the other
+        self._update_lock = threading.Lock()
+        self._compacting = threading.Lock()
+        self._snapshot_due = False
+        self._snapshotting = False
+
+        saved = snapshot.load(self.SNAPSHOT_NAME) if snapshot is not None else None
+        if saved is not None:
+            self.version = tuple(tuple(entry) for entry in json.loads(saved[0]))
+            self._df = saved[1] if len(saved[1].columns) > 0 else None
+            self._unvalidated = True
+
+    def get(self) -> Optional[pd.DataFrame]:
+        """Return the merged corrections (shared, do not modify in place)"""
+        return self.get_versioned()[0]
+
+    def get_versioned(self) -> Tuple[Optional[pd.DataFrame], Optional[Tuple[Tuple[str, str], ...]]]:
+        """Return (merged corrections, version) as one consistent pair"""
+        with self._lock:
+            from_snapshot = self._unvalidated
+            self._unvalidated = False
+            due = self.version is None or time.monotonic() - self._checked_at >= self.revalidate_seconds
+
+        if from_snapshot:
+            threading.Thread(target=self._refresh_quietly, daemon=True).start()
+        elif due:
+            self._refresh()
+
+        with self._lock:
+            return self._merged(), self.version
+
+    def _merged(self) -> Optional[pd.DataFrame]:
+        """Fold queued shards into the table (call with _lock held)"""
+        if self._tail:
+            frames = [self._df] + self._tail if self._df is not None else self._tail
+            self._df, self._tail = concat_frames(frames), []
+        return self._df
+
+    def _refresh_quietly(self):
+        try:
+            self._refresh()
+        except Exception:
+            # Keep serving the snapshot; the next foreground read retries
+            pass
+
+    def _refresh(self):
+        with self._update_lock:
+            if self.version is not None and not self._unvalidated and \
+                    time.monotonic() - self._checked_at < self.revalidate_seconds:
+                return  # another thread refreshed while we waited
+
+            storage = self.frame_cache.storage
+            files = []
+
+            legacy_version = storage.list_files("").get(CORRECTIONS_FILE)
+            if legacy_version is not None:
+                files.append((CORRECTIONS_FILE, legacy_version))
+
+            # Names start with a timestamp, so sorting keeps save order
+            shards = storage.list_files(CORRECTIONS_SHARD_DIR)
+            files.extend((f"{CORRECTIONS_SHARD_DIR}/{name}", shards[name]) for name in sorted(shards))
+
+            version = tuple(files)
+            if version != self.version:
+                known = len(self.version) if self.version else 0
+                if known and version[:known] == self.version:
+                    # Only new shards arrived: append them to the merged table
+                    with self._lock:
+                        base = self._merged()
+                    frames = [base] if base is not None else []
+                    files = files[known:]
+                else:
+                    frames = []
+
+                # Passing the listed version lets each download skip a listing of its own
+                with ThreadPoolExecutor(max_workers=max(min(len(files), SHARD_FETCH_WORKERS), 1)) as pool:
+                    loaded = list(pool.map(lambda entry: self.frame_cache.get(*entry), files))
+                frames.extend(cached[0] for cached in loaded if cached is not None)
+
+                df = concat_frames(frames) if frames else None
+                with self._lock:
+                    self._df, self._tail, self.version = df, [], version
+                self._schedule_snapshot()
+
+            self._checked_at = time.monotonic()
+
+    def add_shard(self, path: str, version: str, df: pd.DataFrame):
+        """Apply a shard this process just wrote without re-reading storage"""
+        df = compact_frame(df)
+        self.frame_cache.put(path, version, df)
+
+        with self._update_lock:
+            if self.version is None:
+                return
+            with self._lock:
+                self._tail.append(df)
+                self.version = self.version + ((path, version),)
+        self._schedule_snapshot()
+
+        self._compact_if_due()
+
+    def _compact_if_due(self):
+        with self._lock:
+            shards = [path for path, _ in self.version or () if path != CORRECTIONS_FILE]
+        if self.compact_at and len(shards) >= self.compact_at and self._compacting.acquire(blocking=False):
+            threading.Thread(target=self._compact, daemon=True).start()
+
+    def _compact(self):
+        """Merge every shard in the table into the legacy file in one commit"""
+        try:
+            with self._lock:
+                df, version = self._merged(), self.version
+            removed = {path: file_version for path, file_version in version if path != CORRECTIONS_FILE}
+
+            new_version = self.frame_cache.storage.replace_files(
+                CORRECTIONS_FILE,
+                df.to_csv(index=False).encode(),
+                dict(version).get(CORRECTIONS_FILE),
+                removed,
+                f"Compact {len(removed)} papaya correction shards"
+            )
+            if new_version is None:
+                return
+
+            self.frame_cache.put(CORRECTIONS_FILE, new_version, df)
+            self.frame_cache.discard(removed)
+
+            # The rows are unchanged; only the files holding them moved
+            with self._update_lock:
+                with self._lock:
+                    if self.version[:len(version)] != version:
+                        return
+                    self.version = ((CORRECTIONS_FILE, new_version),) + self.version[len(version):]
+            self._schedule_snapshot()
+        except Exception:
+            # A conflict or outage leaves the shards in place for the next save to retry
+            pass
+        finally:
+            self._compacting.release()
+
+    def _schedule_snapshot(self):
+        """Mark the snapshot stale, starting its writer thread if none is running"""
+        if self.snapshot is None:
+            return
+        with self._lock:
+            self._snapshot_due = True
+            if self._snapshotting:
+                return
+            self._snapshotting = True
+        threading.Thread(target=self._write_snapshots, daemon=True).start()
+
+    def _write_snapshots(self):
+        # Changes arriving during the delay are folded into the same write
+        while True:
+            time.sleep(self.SNAPSHOT_DELAY)
+            with self._lock:
+                if not self._snapshot_due:
+                    self._snapshotting = False
+                    return
+                self._snapshot_due = False
+                df, version = self._merged(), self.version
+
+            self.snapshot.save(self.SNAPSHOT_NAME, json.dumps(version), df if df is not None else pd.DataFrame())
+
+@st.cache_resource
+def get_corrections_cache() -> CorrectionsCache:
+    """Process-wide corrections cache, shared by all sessions"""
+    return CorrectionsCache(
+        get_frame_cache(),
+        CORRECTIONS_REVALIDATE_SECONDS,
+        get_snapshot_store(),
+        compact_at=COMPACT_SHARDS_AT
+    )
+
+
+class CorrectionWriteQueue:
+    """Coalesces concurrent correction saves from all sessions into one commit.
+
+    The first save to arrive becomes the leader: it waits window_seconds for
+    other sessions to queue their rows, then writes everything pending as a
+    single shard. The other savers block until that write completes. A write
+    that loses a race with another commit, or whose outcome is unknown, is
+    retried under the same shard name, so a retry of a write that already
+    landed is recognised by the backend instead of saving the rows twice.
+    """
+
+    def __init__(self, storage: StorageBackend, corrections_cache: CorrectionsCache,
+                 window_seconds: float, max_attempts: int = 3):
+        self.storage = storage
+        self.corrections_cache = corrections_cache
+        self.window_seconds = window_seconds
+        self.max_attempts = max_attempts
+        self._pending: List[Tuple[pd.DataFrame, Future]] = []
+        self._flushing = False
+        self._lock = threading.Lock()
+
+    def submit(self, corrections_df: pd.DataFrame) -> bool:
+        """Queue rows for saving and wait until the commit holding them is done"""
+        future = Future()
+
+        with self._lock:
+            self._pending.append((corrections_df, future))
+            is_leader = not self._flushing
+            self._flushing = True
+
+        if is_leader:
+            time.sleep(self.window_seconds)
+            self._flush()
+
+        return future.result()
+
+    def _flush(self):
+        while True:
+            with self._lock:
+                batch, self._pending = self._pending, []
+                if not batch:
+                    self._flushing = False
+                    return
+
+            try:
+                saved = self._write(pd.concat([df for df, _ in batch], ignore_index=True))
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for _, future in batch:
+                future.set_result(saved)
+
+    def _write(self, corrections_df: pd.DataFrame) -> bool:
+        csv_data = corrections_df.to_csv(index=False)
+        shard_name = get_corrections_shard_name(corrections_df)
+
+        for attempt in range(self.max_attempts):
+            try:
+                version = self.storage.write_file(
+                    shard_name,
+                    csv_data.encode(),
+                    f"Add papaya corrections - {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+                )
+            except StorageError:
+                if attempt == self.max_attempts - 1:
+                    raise
+                time.sleep(random.uniform(0, 0.5 * 2 ** attempt))
+                continue
+
+            if version is None:
+                return False
+
+            # Parse back what was written so the cache matches what readers will load
+            self.corrections_cache.add_shard(shard_name, version, pd.read_csv(io.StringIO(csv_data)))
+            return True
+
+        return False
+
+@st.cache_resource
+def get_write_queue() -> CorrectionWriteQueue:
+    """Process-wide write queue, shared by all sessions"""
+    return CorrectionWriteQueue(get_storage(), get_corrections_cache(), WRITE_COALESCE_SECONDS)
+
+
+class TokenStatus:
+    """Cached result of the storage credential check.
+
+    Only the first check blocks. Afterwards a valid result is returned
+    immediately and re-checked in the background once it is older than
+    ttl_seconds. A 401 from any storage call marks the token invalid at once;
+    an invalid result is re-checked (blocking) after INVALID_TTL seconds, so
+    a rotated token is picked up almost immediately.
+    """
+
+    INVALID_TTL = 5.0
+
+    def __init__(self, storage: StorageBackend, ttl_seconds: float):
+        self.storage = storage
+        self.ttl_seconds = ttl_seconds
+        self.valid: Optional[bool] = None
+        # Monotonic time is arbitrary (it can be small after boot): never checked is always due
+        self._checked_at = float('-inf')
+        self._checking = False
+        self._lock = threading.Lock()
+        storage.set_unauthorized_handler(self.mark_invalid)
+
+    def is_valid(self) -> bool:
+        with self._lock:
+            ttl = self.ttl_seconds if self.valid else self.INVALID_TTL
+            expired = time.monotonic() - self._checked_at >= ttl
+            # An invalid token stops the app, so its re-check may block
+            blocking = self.valid is not True
+            start = expired and (blocking or not self._checking)
+            if start:
+                self._checking = True
+
+        if start and blocking:
+            self._check()
+        elif start:
+            threading.Thread(target=self._check, daemon=True).start()
+
+        return bool(self.valid)
+
+    def _check(self):
+        try:
+            valid = self.storage.check_access()
+        except Exception:
+            # Network trouble is not proof of a bad token: keep a known result
+            valid = self.valid if self.valid is not None else False
+
+        with self._lock:
+            self.valid = valid
+            self._checked_at = time.monotonic()
+            self._checking = False
+
+    def mark_invalid(self):
+        with self._lock:
+            self.valid = False
+            self._checked_at = time.monotonic()
+
+@st.cache_resource
+def get_token_status() -> TokenStatus:
+    """Process-wide token check result, shared by all sessions"""
+    return TokenStatus(get_storage(), TOKEN_CHECK_TTL)
+
 # ============================================================================
 # GITHUB API FUNCTIONS
 # ============================================================================
@@ -209,35 +1237,54 @@ def get_github_headers() -> Dict[str, str]:
         "Accept": "application/vnd.github.v3+json"
     }
 
+def fetch_files_from_github(filenames: List[str]) -> Dict[str, Optional[pd.DataFrame]]:
+    """Fetch and parse CSV files from the configured storage concurrently"""
+    frame_cache = get_frame_cache()
+    
+    with ThreadPoolExecutor(max_workers=max(len(filenames), 1)) as pool:
+        futures = {filename: pool.submit(frame_cache.get, filename) for filename in filenames}
+    
+    # Errors are reported here on the script thread, where st.error can render
+    frames = {}
+    for filename, future in futures.items():
+        frames[filename] = None
+        try:
+            cached = future.result()
+            
+            if cached is None:
+                st.error(f"Failed to load {filename}: 404")
+                continue
+            
+            # Shallow copy: tagging attrs must not touch the shared frame, and
+            # load_data_from_github hands each caller its own copy anyway
+            frames[filename] = cached[0].copy(deep=False)
+            frames[filename].attrs['source_version'] = cached[1]
+            
+        except requests.exceptions.Timeout:
+            st.error(f"⏱️ Timeout loading {filename}. Please check your connection.")
+        except StorageError as e:
+            st.error(f"Failed to load {filename}: {str(e)}")
+        except Exception as e:
+            st.error(f"Error loading {filename}: {str(e)}")
+    
+    return frames
+
 def fetch_file_from_github(filename: str) -> Optional[pd.DataFrame]:
-    """Fetch and parse CSV file from GitHub"""
-    try:
-        headers = get_github_headers()
-        url = f"https://api.github.com/repos/{GITHUB_OWNER}/{GITHUB_REPO}/contents/{filename}"
-        
-        response = requests.get(url, headers=headers, timeout=10)
-        
-        if response.status_code != 200:
-            st.error(f"Failed to load {filename}: {response.status_code}")
-            return None
-        
-        content = base64.b64decode(response.json()['content']).decode('utf-8')
-        df = pd.read_csv(io.StringIO(content))
-        
-        return df
-        
-    except requests.exceptions.Timeout:
-        st.error(f"⏱️ Timeout loading {filename}. Please check your connection.")
-        return None
-    except Exception as e:
-        st.error(f"Error loading {filename}: {str(e)}")
-        return None
+    """Fetch and parse CSV file from the configured storage"""
+    return fetch_files_from_github([filename])[filename]
 
 @st.cache_data(ttl=CACHE_TTL)
 def load_data_from_github() -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame]]:
-    """Load constraints and logic data from GitHub with caching"""
-    constraints_df = fetch_file_from_github(CONSTRAINTS_FILE)
-    logic_df = fetch_file_from_github(LOGIC_FILE)
+    """Load constraints and logic data from storage with caching"""
+    frames = fetch_files_from_github(DATA_FILES)
+    constraints_df = frames[CONSTRAINTS_FILE]
+    logic_df = frames[LOGIC_FILE]
+    
+    # Compile the rule texts now so rendering only looks them up
+    for df in (constraints_df, logic_df):
+        reason_col = get_schema(df)['reason']
+        if reason_col:
+            build_rule_table(df[reason_col])
     
     if constraints_df is not None and logic_df is not None:
         st.success("✅ Data loaded from secure repository")
@@ -245,193 +1292,134 @@ def load_data_from_github() -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFra
     return constraints_df, logic_df
 
 def load_existing_corrections() -> Optional[pd.DataFrame]:
-    """Load existing corrections from GitHub"""
+    """Load existing corrections (legacy file plus all shards) through the shared cache"""
+    return load_corrections_with_version()[0]
+
+def load_corrections_with_version() -> Tuple[Optional[pd.DataFrame], Optional[Tuple]]:
+    """Load existing corrections together with the version they were built from"""
     try:
-        headers = get_github_headers()
-        corrections_url = f"https://api.github.com/repos/{GITHUB_OWNER}/{GITHUB_REPO}/contents/{CORRECTIONS_FILE}"
-        response = requests.get(corrections_url, headers=headers)
-        
-        if response.status_code == 200:
-            corrections_content = base64.b64decode(response.json()['content']).decode('utf-8')
-            return pd.read_csv(io.StringIO(corrections_content))
-        else:
-            return None
+        return get_corrections_cache().get_versioned()
     except:
-        return None
+        return None, None
+
+def get_corrections_shard_name(corrections_df: pd.DataFrame) -> str:
+    """Build a unique, chronologically sortable shard path for one commit"""
+    enumerators = corrections_df['corrected_by'].unique() if 'corrected_by' in corrections_df.columns else []
+    enumerator = enumerators[0] if len(enumerators) == 1 else 'batch'
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+    return f"{CORRECTIONS_SHARD_DIR}/{timestamp}_{enumerator}_{uuid.uuid4().hex[:8]}.csv"
 
 def save_corrections_to_github(corrections_df: pd.DataFrame) -> bool:
-    """Save or append corrections to GitHub"""
+    """Append corrections to storage as a new shard"""
     try:
-        headers = get_github_headers()
-        corrections_url = f"https://api.github.com/repos/{GITHUB_OWNER}/{GITHUB_REPO}/contents/{CORRECTIONS_FILE}"
-        
-        # Check if file exists and load existing data
-        response = requests.get(corrections_url, headers=headers)
-        sha = None
-        
-        if response.status_code == 200:
-            sha = response.json()['sha']
-            # Load existing corrections
-            existing_content = base64.b64decode(response.json()['content']).decode('utf-8')
-            existing_df = pd.read_csv(io.StringIO(existing_content))
-            # Append new corrections
-            corrections_df = pd.concat([existing_df, corrections_df], ignore_index=True)
-        
-        # Convert to CSV and encode
-        csv_data = corrections_df.to_csv(index=False)
-        encoded_data = base64.b64encode(csv_data.encode()).decode()
-        
-        # Prepare payload
-        payload = {
-            "message": f"Add papaya corrections - {datetime.now().strftime('%Y-%m-%d %H:%M')}",
-            "content": encoded_data,
-            "branch": "main"
-        }
-        
-        if sha:
-            payload["sha"] = sha
-            
-        response = requests.put(corrections_url, headers=headers, json=payload, timeout=10)
-        return response.status_code in [200, 201]
+        # Shards hold only new rows, so a save never depends on (or rewrites)
+        # the existing history; concurrent saves share one commit
+        return get_write_queue().submit(corrections_df)
         
     except Exception as e:
         st.error(f"Error saving to GitHub: {str(e)}")
         return False
 
 def check_token_validity() -> bool:
-    """Verify GitHub token is valid"""
+    """Verify the storage credentials are valid (cached, see TokenStatus)"""
     try:
-        headers = get_github_headers()
-        response = requests.get("https://api.github.com/user", headers=headers, timeout=5)
-        
-        if response.status_code == 401:
-            st.error("🔐 Access token expired. Please contact administrator.")
-            return False
-        return True
+        valid = get_token_status().is_valid()
     except:
         return False
+    
+    if not valid:
+        st.error("🔐 Access token expired. Please contact administrator.")
+    return valid
 
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def get_unique_id_column(df: pd.DataFrame) -> Optional[str]:
-    """Find the unique ID column name in the dataframe"""
-    if df is None or len(df) == 0:
+@functools.lru_cache(maxsize=64)
+def resolve_schema(columns: Tuple[str, ...]) -> Dict[str, Optional[str]]:
+    """Map the logical fields (id, farmer name, phone, date, reason, location) to columns.
+
+    Cached by column tuple, so each dataset layout is resolved only once and
+    every renderer and record builder reuses the same mapping. The returned
+    dict is shared and must not be modified.
+    """
+    def first_present(possible_names: List[str]) -> Optional[str]:
+        for col_name in possible_names:
+            if col_name in columns:
+                return col_name
         return None
     
-    possible_names = [
+    id_col = first_present([
         'unique_id', 'Unique_id', 'UNIQUE_ID', 'UniqueID', 'unique_ID',
         'id', 'ID', 'farmer_id', 'Farmer_ID', 'farmerid'
-    ]
-    
-    for col_name in possible_names:
-        if col_name in df.columns:
-            return col_name
+    ])
+    if id_col is None:
+        id_col = next((col for col in columns if 'id' in col.lower()), None)
     
-    for col in df.columns:
-        if 'id' in col.lower():
-            return col
+    return {
+        'id': id_col,
+        'farmer_name': first_present([
+            'farmer_name', 'resp_name', 'respondent_name', 'name',
+            'farmer', 'respondent', 'hh_name', 'hh_head_name'
+        ]),
+        'phone': first_present([
+            'phone_no', 'phone', 'telephone', 'mobile', 'contact',
+            'phone_number', 'tel', 'cell'
+        ]),
+        'date': first_present([
+            'subdate', 'startdate', 'date', 'submission_date',
+            'interview_date', 'survey_date'
+        ]),
+        'reason': first_present([
+            'reason', 'constraint', 'rule', 'validation',
+            'error_message', 'message', 'description'
+        ]),
+        'woreda': first_present(['woreda', 'Woreda', 'WOREDA', 'district', 'District']),
+        'kebele': first_present(['kebele', 'Kebele', 'KEBELE', 'sub_district', 'village_admin']),
+        'village': first_present(['village', 'Village', 'VILLAGE', 'gote', 'Gote', 'community'])
+    }
+
+EMPTY_SCHEMA = resolve_schema(())
+
+def get_schema(df: pd.DataFrame) -> Dict[str, Optional[str]]:
+    """Get the resolved column mapping for a dataframe"""
+    if df is None or len(df) == 0:
+        return EMPTY_SCHEMA
     
-    return None
+    return resolve_schema(tuple(df.columns))
+
+def get_row_schema(row) -> Dict[str, Optional[str]]:
+    """Get the resolved column mapping for a single error row (Series or dict)"""
+    return resolve_schema(tuple(row.keys()))
+
+def get_unique_id_column(df: pd.DataFrame) -> Optional[str]:
+    """Find the unique ID column name in the dataframe"""
+    return get_schema(df)['id']
 
 def get_farmer_name_column(df: pd.DataFrame) -> Optional[str]:
     """Find the farmer name column in the dataframe"""
-    if df is None or len(df) == 0:
-        return None
-    
-    possible_names = [
-        'farmer_name', 'resp_name', 'respondent_name', 'name', 
-        'farmer', 'respondent', 'hh_name', 'hh_head_name'
-    ]
-    
-    for col_name in possible_names:
-        if col_name in df.columns:
-            return col_name
-    
-    return None
+    return get_schema(df)['farmer_name']
 
 def get_phone_column(df: pd.DataFrame) -> Optional[str]:
     """Find the phone number column in the dataframe"""
-    if df is None or len(df) == 0:
-        return None
-    
-    possible_names = [
-        'phone_no', 'phone', 'telephone', 'mobile', 'contact',
-        'phone_number', 'tel', 'cell'
-    ]
-    
-    for col_name in possible_names:
-        if col_name in df.columns:
-            return col_name
-    
-    return None
+    return get_schema(df)['phone']
 
 def get_date_column(df: pd.DataFrame) -> Optional[str]:
     """Find the date column in the dataframe"""
-    if df is None or len(df) == 0:
-        return None
-    
-    possible_names = [
-        'subdate', 'startdate', 'date', 'submission_date', 
-        'interview_date', 'survey_date'
-    ]
-    
-    for col_name in possible_names:
-        if col_name in df.columns:
-            return col_name
-    
-    return None
+    return get_schema(df)['date']
 
 def get_reason_column(df: pd.DataFrame) -> Optional[str]:
     """Find the reason/constraint column in the dataframe"""
-    if df is None or len(df) == 0:
-        return None
-    
-    possible_names = [
-        'reason', 'constraint', 'rule', 'validation', 
-        'error_message', 'message', 'description'
-    ]
-    
-    for col_name in possible_names:
-        if col_name in df.columns:
-            return col_name
-    
-    return None
+    return get_schema(df)['reason']
 
 def get_location_columns(df: pd.DataFrame) -> Dict[str, Optional[str]]:
     """Find location columns (woreda, kebele, village) in the dataframe"""
-    location_cols = {
-        'woreda': None,
-        'kebele': None,
-        'village': None
+    schema = get_schema(df)
+    return {
+        'woreda': schema['woreda'],
+        'kebele': schema['kebele'],
+        'village': schema['village']
     }
-    
-    if df is None or len(df) == 0:
-        return location_cols
-    
-    # Check for woreda
-    woreda_names = ['woreda', 'Woreda', 'WOREDA', 'district', 'District']
-    for name in woreda_names:
-        if name in df.columns:
-            location_cols['woreda'] = name
-            break
-    
-    # Check for kebele
-    kebele_names = ['kebele', 'Kebele', 'KEBELE', 'sub_district', 'village_admin']
-    for name in kebele_names:
-        if name in df.columns:
-            location_cols['kebele'] = name
-            break
-    
-    # Check for village
-    village_names = ['village', 'Village', 'VILLAGE', 'gote', 'Gote', 'community']
-    for name in village_names:
-        if name in df.columns:
-            location_cols['village'] = name
-            break
-    
-    return location_cols
 
 def safe_get_unique_ids(df: pd.DataFrame) -> set:
     """Safely get unique IDs from dataframe"""
@@ -444,6 +1432,24 @@ def safe_get_unique_ids(df: pd.DataFrame) -> set:
     
     return set(df[id_col].unique())
 
+# Download formats: label -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    'CSV': ('csv', 'text/csv'),
+    'CSV (gzip)': ('csv.gz', 'application/gzip'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet')
+}
+
+@st.cache_data(max_entries=12)
+def export_frame(_df: pd.DataFrame, data_key, export_format: str) -> bytes:
+    """Serialize a frame for download (cached per data_key and format, so unchanged data is not re-encoded)"""
+    if export_format == 'Parquet':
+        buffer = io.BytesIO()
+        make_arrow_safe(_df).to_parquet(buffer, index=False)
+        return buffer.getvalue()
+    
+    data = _df.to_csv(index=False).encode('utf-8')
+    return gzip.compress(data) if export_format == 'CSV (gzip)' else data
+
 def format_display_value(value) -> str:
     """Format a value for display, handling None, NaN, and special values"""
     if value is None:
@@ -459,58 +1465,98 @@ def format_display_value(value) -> str:
 # DATA PROCESSING FUNCTIONS
 # ============================================================================
 
-def extract_constraint_limits(constraint_text: str) -> Tuple[int, int]:
-    """Extract min/max values from constraint text for display purposes only"""
+RULE_NUMBER_PATTERN = re.compile(r'\d+')
+
+class ConstraintRule(NamedTuple):
+    """Limits parsed from one constraint text; operator is None when no bound was found"""
+    min_val: int
+    max_val: int
+    operator: Optional[str]
+
+@functools.lru_cache(maxsize=4096)
+def compile_constraint_rule(constraint_text: str) -> ConstraintRule:
+    """Parse a constraint text into a rule once; the cache is the process-wide rule table"""
     min_val, max_val = 0, 100000
+    operator = None
     
     try:
-        constraint_lower = str(constraint_text).lower()
-        numbers = re.findall(r'\d+', constraint_text)
+        constraint_lower = constraint_text.lower()
+        numbers = RULE_NUMBER_PATTERN.findall(constraint_text)
         
         if 'max' in constraint_lower and numbers:
             max_val = int(numbers[-1])
+            operator = 'max'
         if 'min' in constraint_lower and numbers:
             min_val = int(numbers[-1])
+            operator = 'min'
             
         if 'between' in constraint_lower and len(numbers) >= 2:
             min_val = int(numbers[0])
             max_val = int(numbers[1])
+            operator = 'between'
             
     except:
         pass
     
-    return min_val, max_val
+    return ConstraintRule(min_val, max_val, operator)
 
-def get_corrected_error_keys(enumerator: str) -> set:
-    """Get set of already corrected error keys for this enumerator"""
-    existing_corrections = load_existing_corrections()
+def build_rule_table(rule_texts: Optional[pd.Series]) -> Dict[str, ConstraintRule]:
+    """Compile each distinct rule text in a column once, for lookups and bulk range checks"""
+    if rule_texts is None:
+        return {}
     
-    if existing_corrections is None or len(existing_corrections) == 0:
-        return set()
+    return {text: compile_constraint_rule(str(text)) for text in rule_texts.dropna().unique()}
+
+def extract_constraint_limits(constraint_text: str) -> Tuple[int, int]:
+    """Extract min/max values from constraint text for display purposes only"""
+    rule = compile_constraint_rule(str(constraint_text))
+    return rule.min_val, rule.max_val
+
+def get_error_index(error_type, unique_ids: pd.Series, variables: pd.Series) -> pd.MultiIndex:
+    """Build (error_type, unique_id, variable) keys, with IDs and variables as strings"""
+    error_types = error_type.astype(str) if isinstance(error_type, pd.Series) else [error_type] * len(unique_ids)
+    return pd.MultiIndex.from_arrays(
+        [error_types, unique_ids.astype(str), variables.astype(str)],
+        names=['error_type', 'unique_id', 'variable']
+    )
+
+def get_correction_key(draft: Dict) -> Tuple[str, str, str]:
+    """Get the (error_type, unique_id, variable) key of a drafted correction"""
+    return (draft['error_type'], draft['farmer_id'], draft['variable'])
+
+@st.cache_data(max_entries=2 * len(VALID_ENUMERATORS))
+def build_corrected_error_index(_corrections: pd.DataFrame, corrections_version, enumerator: str) -> pd.MultiIndex:
+    """Index saved corrections by key for one enumerator (cached per corrections version)"""
+    enumerator_corrections = _corrections[_corrections['corrected_by'] == enumerator]
     
-    enumerator_corrections = existing_corrections[
-        existing_corrections['corrected_by'] == enumerator
-    ]
+    if 'unique_id' in enumerator_corrections.columns:
+        id_col = 'unique_id'
+    else:
+        id_col = next((c for c in enumerator_corrections.columns if 'id' in c.lower() and c != 'error_type'), None)
+        if id_col is None:
+            return get_error_index('', pd.Series(dtype=str), pd.Series(dtype=str))
+    
+    unique_ids = enumerator_corrections[id_col]
+    has_id = unique_ids.notna() & (unique_ids.astype(str) != '')
+    enumerator_corrections = enumerator_corrections[has_id]
+    
+    return get_error_index(
+        enumerator_corrections['error_type'],
+        enumerator_corrections[id_col],
+        enumerator_corrections['variable']
+    )
+
+def get_corrected_error_keys(enumerator: str) -> pd.MultiIndex:
+    """Get the (error_type, unique_id, variable) index of already corrected errors for this enumerator"""
+    existing_corrections, version = load_corrections_with_version()
     
-    corrected_keys = set()
-    for _, row in enumerator_corrections.iterrows():
-        unique_id = None
-        if 'unique_id' in row:
-            unique_id = row['unique_id']
-        else:
-            for col in row.index:
-                if 'id' in col.lower() and col != 'error_type':
-                    unique_id = row[col]
-                    break
-        
-        if unique_id:
-            error_key = f"{row['error_type']}_{unique_id}_{row['variable']}"
-            corrected_keys.add(error_key)
+    if existing_corrections is None or len(existing_corrections) == 0:
+        return get_error_index('', pd.Series(dtype=str), pd.Series(dtype=str))
     
-    return corrected_keys
+    return build_corrected_error_index(existing_corrections, version, enumerator)
 
 def filter_uncorrected_errors(df: pd.DataFrame, error_type: str, enumerator: str) -> pd.DataFrame:
-    """Remove already corrected errors from dataframe"""
+    """Remove already corrected errors from dataframe (anti-join on the corrected index)"""
     if df is None or len(df) == 0:
         return pd.DataFrame()
     
@@ -518,178 +1564,383 @@ def filter_uncorrected_errors(df: pd.DataFrame, error_type: str, enumerator: str
     if id_col is None:
         return pd.DataFrame()
     
-    corrected_keys = get_corrected_error_keys(enumerator)
-    all_corrected = corrected_keys.union(st.session_state.corrected_errors)
+    corrected = get_corrected_error_keys(enumerator)
+    if st.session_state.corrected_errors:
+        corrected = corrected.append(pd.MultiIndex.from_tuples(
+            list(st.session_state.corrected_errors), names=corrected.names
+        ))
     
-    return df[~df.apply(
-        lambda x: f"{error_type}_{x[id_col]}_{x['variable']}" in all_corrected,
-        axis=1
-    )]
-
-def get_enumerator_statistics(constraints_df: pd.DataFrame, logic_df: pd.DataFrame) -> pd.DataFrame:
-    """Get detailed statistics for each enumerator"""
-    stats = []
+    if len(corrected) == 0:
+        return df
     
-    existing_corrections = load_existing_corrections()
+    return df[~get_error_index(error_type, df[id_col], df['variable']).isin(corrected)]
+
+def build_enumerator_metrics(constraint_counts: pd.Series, logic_counts: pd.Series, solved_counts: pd.Series) -> pd.DataFrame:
+    """Derive every per-enumerator metric from error and solved counts keyed by username"""
+    index = pd.Index(VALID_ENUMERATORS, name='Username')
+    
+    metrics = pd.DataFrame({
+        'Constraint Errors': constraint_counts.reindex(index, fill_value=0).astype('int64'),
+        'Logic Errors': logic_counts.reindex(index, fill_value=0).astype('int64'),
+        'Solved': solved_counts.reindex(index, fill_value=0).astype('int64')
+    }, index=index)
+    
+    total = metrics['Constraint Errors'] + metrics['Logic Errors']
+    all_errors = total.sum()
+    
+    metrics['Total Errors'] = total
+    metrics['Remaining'] = total - metrics['Solved']
+    metrics['Progress (%)'] = (metrics['Solved'] / total * 100).where(total > 0, 0).round(1)
+    metrics['Error Rate (%)'] = (total / all_errors * 100).round(2) if all_errors > 0 else 0.0
+    metrics['Completion Rate (%)'] = (metrics['Solved'] / total * 100).where(total > 0, 0).round(2)
+    
+    return metrics.reset_index()
+
+def get_farmer_info(row: pd.Series, schema: Dict[str, Optional[str]]) -> Dict[str, str]:
+    """Get a farmer's name, phone and location from one of their error rows"""
+    farmer_name_col = schema['farmer_name']
+    phone_col = schema['phone']
     
-    for enumerator in VALID_ENUMERATORS:
-        constraint_errors = 0
-        logic_errors = 0
-        
-        if constraints_df is not None and len(constraints_df) > 0:
-            constraint_errors = len(constraints_df[constraints_df['username'] == enumerator])
-        
-        if logic_df is not None and len(logic_df) > 0:
-            logic_errors = len(logic_df[logic_df['username'] == enumerator])
-        
-        total_errors = constraint_errors + logic_errors
-        
-        solved = 0
-        if existing_corrections is not None:
-            solved = len(existing_corrections[existing_corrections['corrected_by'] == enumerator])
+    return {
+        'farmer_name': row.get(farmer_name_col, 'Unknown') if farmer_name_col else row.get('resp_name', row.get('farmer_name', 'Unknown')),
+        'phone_no': row.get(phone_col, 'N/A') if phone_col else row.get('phone_no', 'N/A'),
+        'woreda': row.get(schema['woreda'], '') if schema['woreda'] else row.get('woreda', ''),
+        'kebele': row.get(schema['kebele'], '') if schema['kebele'] else row.get('kebele', ''),
+        'village': row.get(schema['village'], '') if schema['village'] else row.get('village', '')
+    }
+
+def build_farmer_index(enumerator_constraints: pd.DataFrame, enumerator_logic: pd.DataFrame, id_col: str,
+                       constraint_schema: Dict[str, Optional[str]], logic_schema: Dict[str, Optional[str]]) -> Dict:
+    """Group an enumerator's pending errors by farmer in one pass over each frame"""
+    def group_by_farmer(df: pd.DataFrame) -> Dict:
+        if len(df) == 0 or id_col not in df.columns:
+            return {}
+        return dict(tuple(df.groupby(id_col, sort=False)))
+    
+    constraint_groups = group_by_farmer(enumerator_constraints)
+    logic_groups = group_by_farmer(enumerator_logic)
+    
+    farmer_index = {}
+    for farmer_id in constraint_groups.keys() | logic_groups.keys():
+        farmer_constraint_errors = constraint_groups.get(farmer_id, pd.DataFrame())
+        farmer_logic_errors = logic_groups.get(farmer_id, pd.DataFrame())
         
-        remaining = total_errors - solved
-        percentage = (solved / total_errors * 100) if total_errors > 0 else 0
+        if len(farmer_constraint_errors) > 0:
+            info = get_farmer_info(farmer_constraint_errors.iloc[0], constraint_schema)
+        else:
+            info = get_farmer_info(farmer_logic_errors.iloc[0], logic_schema)
         
-        stats.append({
-            'Username': enumerator,
-            'Total Errors': total_errors,
-            'Solved': solved,
-            'Remaining': remaining,
-            'Progress (%)': round(percentage, 1)
-        })
-    
-    stats_df = pd.DataFrame(stats)
-    stats_df = stats_df.sort_values('Remaining', ascending=False)
+        farmer_index[farmer_id] = {
+            'constraint_errors': farmer_constraint_errors,
+            'logic_errors': farmer_logic_errors,
+            # The enumerator-level frames the groups came from, for drafts to reference
+            'constraint_source': enumerator_constraints,
+            'logic_source': enumerator_logic,
+            **info
+        }
     
-    return stats_df
+    return farmer_index
 
-def get_comprehensive_error_analysis(constraints_df: pd.DataFrame, logic_df: pd.DataFrame) -> Dict:
-    """Generate comprehensive error analysis summary"""
-    analysis = {
-        'error_type_overview': {},
-        'error_rate_by_enumerator': [],
-        'enumerators_without_errors': [],
-        'most_common_variables': {},
-        'strange_values': [],
-        'overall_stats': {}
-    }
+def get_enumerator_workload(enumerator: str, constraints_df: pd.DataFrame, logic_df: pd.DataFrame, id_col: str,
+                            constraint_schema: Dict[str, Optional[str]], logic_schema: Dict[str, Optional[str]]) -> Dict:
+    """Get an enumerator's pending errors indexed by farmer, reused until the data changes.
+
+    The result is kept in session state and rebuilt only when the error
+    files, the saved corrections or this session's saves change.
+    """
+    existing_corrections, corrections_version = load_corrections_with_version()
+    cache_key = (
+        enumerator,
+        constraints_df.attrs.get('source_version') if constraints_df is not None else None,
+        logic_df.attrs.get('source_version') if logic_df is not None else None,
+        corrections_version,
+        len(st.session_state.corrected_errors)
+    )
     
-    all_errors = []
+    workload = st.session_state.enumerator_workload
+    if workload is not None and workload['key'] == cache_key and None not in cache_key[1:4]:
+        return workload
     
-    if constraints_df is not None and len(constraints_df) > 0:
-        constraint_errors = constraints_df.copy()
-        constraint_errors['error_category'] = 'Constraint'
-        all_errors.append(constraint_errors)
+    enumerator_constraints = filter_uncorrected_errors(
+        constraints_df[constraints_df['username'] == enumerator] if constraints_df is not None else pd.DataFrame(),
+        'constraint',
+        enumerator
+    )
     
-    if logic_df is not None and len(logic_df) > 0:
-        logic_errors = logic_df.copy()
-        logic_errors['error_category'] = 'Logic'
-        all_errors.append(logic_errors)
+    enumerator_logic = filter_uncorrected_errors(
+        logic_df[logic_df['username'] == enumerator] if logic_df is not None else pd.DataFrame(),
+        'logic',
+        enumerator
+    )
     
-    if not all_errors:
-        return analysis
+    farmers = build_farmer_index(enumerator_constraints, enumerator_logic, id_col, constraint_schema, logic_schema)
     
-    combined_errors = pd.concat(all_errors, ignore_index=True)
+    saved_count = 0
+    if existing_corrections is not None:
+        saved_count = int((existing_corrections['corrected_by'] == enumerator).sum())
+    
+    workload = {
+        'key': cache_key,
+        'farmers': farmers,
+        'farmer_ids': sorted(farmers),
+        'total_errors': len(enumerator_constraints) + len(enumerator_logic),
+        'saved_count': saved_count
+    }
+    st.session_state.enumerator_workload = workload
     
-    id_col = get_unique_id_column(combined_errors)
-    unique_farmers = combined_errors[id_col].nunique() if id_col else 0
+    return workload
+
+def get_enumerator_statistics(constraints_df: pd.DataFrame, logic_df: pd.DataFrame) -> pd.DataFrame:
+    """Get detailed statistics for each enumerator"""
+    metrics = refresh_error_analytics(constraints_df, logic_df)[1]
     
-    analysis['error_type_overview'] = {
-        'Total Constraint Errors': len(constraints_df) if constraints_df is not None else 0,
-        'Total Logic Errors': len(logic_df) if logic_df is not None else 0,
-        'Total Errors': len(combined_errors),
-        'Unique Farmers Affected': unique_farmers
-    }
+    stats_df = metrics[['Username', 'Total Errors', 'Solved', 'Remaining', 'Progress (%)']]
+    stats_df = stats_df.sort_values('Remaining', ascending=False)
     
-    enumerator_analysis = []
-    for enumerator in VALID_ENUMERATORS:
-        enum_errors = combined_errors[combined_errors['username'] == enumerator]
-        constraint_count = len(enum_errors[enum_errors['error_category'] == 'Constraint'])
-        logic_count = len(enum_errors[enum_errors['error_category'] == 'Logic'])
-        total_count = len(enum_errors)
-        
-        if total_count > 0:
-            existing_corrections = load_existing_corrections()
-            solved = 0
-            if existing_corrections is not None:
-                solved = len(existing_corrections[existing_corrections['corrected_by'] == enumerator])
-            
-            error_rate = (total_count / analysis['error_type_overview']['Total Errors'] * 100) if analysis['error_type_overview']['Total Errors'] > 0 else 0
-            
-            enumerator_analysis.append({
-                'Username': enumerator,
-                'Constraint Errors': constraint_count,
-                'Logic Errors': logic_count,
-                'Total Errors': total_count,
-                'Solved': solved,
-                'Remaining': total_count - solved,
-                'Error Rate (%)': round(error_rate, 2),
-                'Completion Rate (%)': round((solved / total_count * 100), 2) if total_count > 0 else 0
-            })
-    
-    analysis['error_rate_by_enumerator'] = pd.DataFrame(enumerator_analysis).sort_values('Total Errors', ascending=False)
-    
-    enumerators_with_errors = set(combined_errors['username'].unique())
-    analysis['enumerators_without_errors'] = [e for e in VALID_ENUMERATORS if e not in enumerators_with_errors]
-    
-    variable_counts = combined_errors.groupby(['variable', 'error_category']).size().reset_index(name='count')
-    variable_counts = variable_counts.sort_values('count', ascending=False)
-    
-    analysis['most_common_variables'] = {
-        'top_constraint_variables': variable_counts[variable_counts['error_category'] == 'Constraint'].head(10),
-        'top_logic_variables': variable_counts[variable_counts['error_category'] == 'Logic'].head(10),
-        'overall_top_variables': variable_counts.head(15)
-    }
+    return stats_df
+
+def detect_strange_values(errors: pd.DataFrame) -> pd.DataFrame:
+    """Flag extremely large (> 100000) and negative non-temperature values in one columnar pass"""
+    if errors is None or len(errors) == 0 or 'value' not in errors.columns:
+        return pd.DataFrame()
     
-    strange_values = []
+    values = pd.to_numeric(errors['value'], errors='coerce')
+    variables = errors['variable'].astype(str)
     
-    for _, row in combined_errors.iterrows():
-        try:
-            value = float(row['value'])
-            error_cat = row['error_category']
-            
-            farmer_name_col = get_farmer_name_column(combined_errors)
-            farmer_name = row.get(farmer_name_col, 'N/A') if farmer_name_col else 'N/A'
-            
-            reason_col = get_reason_column(combined_errors)
-            reason = row.get(reason_col, row.get('constraint', 'N/A')) if reason_col else row.get('constraint', 'N/A')
-            
-            if value > 100000:
-                strange_values.append({
-                    'Type': f'{error_cat} - Extremely Large',
-                    'Variable': row['variable'],
-                    'Value': value,
-                    'Username': row.get('username', 'N/A'),
-                    'Farmer': farmer_name,
-                    'Reason': reason
-                })
-            
-            if value < 0 and 'temp' not in row['variable'].lower():
-                strange_values.append({
-                    'Type': f'{error_cat} - Negative Value',
-                    'Variable': row['variable'],
-                    'Value': value,
-                    'Username': row.get('username', 'N/A'),
-                    'Farmer': farmer_name,
-                    'Reason': reason
-                })
-        except:
-            pass
+    is_large = values > 100000
+    is_negative = (values < 0) & ~variables.str.lower().str.contains('temp', regex=False)
     
-    analysis['strange_values'] = pd.DataFrame(strange_values) if strange_values else pd.DataFrame()
+    flagged = is_large | is_negative
+    if not flagged.any():
+        return pd.DataFrame()
     
-    enumerators_with_errors_count = len(enumerators_with_errors)
-    analysis['overall_stats'] = {
-        'Total Enumerators': len(VALID_ENUMERATORS),
-        'Enumerators with Errors': enumerators_with_errors_count,
-        'Enumerators without Errors': len(analysis['enumerators_without_errors']),
-        'Average Errors per Enumerator': round(analysis['error_type_overview']['Total Errors'] / enumerators_with_errors_count, 2) if enumerators_with_errors_count > 0 else 0,
-        'Unique Variables with Errors': combined_errors['variable'].nunique(),
-        'Strange Values Detected': len(strange_values)
-    }
+    # Resolve optional columns once for the whole frame
+    farmer_name_col = get_farmer_name_column(errors)
+    reason_col = get_reason_column(errors)
     
-    return analysis
+    rows = errors[flagged]
+    if reason_col:
+        reason = rows[reason_col]
+        if 'constraint' in rows.columns and reason_col != 'constraint':
+            reason = reason.fillna(rows['constraint'])
+    else:
+        reason = rows['constraint'] if 'constraint' in rows.columns else 'N/A'
+    
+    return pd.DataFrame({
+        'Type': rows['error_category'].astype(str) + is_large[flagged].map({True: ' - Extremely Large', False: ' - Negative Value'}),
+        'Variable': rows['variable'],
+        'Value': values[flagged],
+        'Username': rows['username'] if 'username' in rows.columns else 'N/A',
+        'Farmer': rows[farmer_name_col] if farmer_name_col else 'N/A',
+        'Reason': reason
+    })
+
+class ErrorAnalytics:
+    """Dashboard aggregates kept up to date from deltas instead of full recomputes.
+
+    Error rows are keyed by their content hash and occurrence number, so a
+    changed error file only adds and removes the rows that differ; an
+    unchanged one (same storage version) costs nothing. Corrections are
+    append-only: when the corrections version extends the one already
+    counted, only the trailing rows are applied. The analysis is rebuilt
+    from the small aggregates only when something changed, and is shared by
+    all sessions, so it must not be modified in place.
+    """
+
+    CATEGORIES = (('constraint', 'Constraint'), ('logic', 'Logic'))
+    _UNSET = object()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions: Dict[str, Optional[str]] = {}
+        self._rows: Dict[str, pd.DataFrame] = {}
+        self._strange: Dict[str, pd.DataFrame] = {}
+        self._enumerator_counts: Dict[str, pd.Series] = {}
+        self._variable_counts: Dict[str, pd.Series] = {}
+        self._farmer_counts = pd.Series(dtype='int64')
+        self._solved = pd.Series(dtype='int64')
+        self._corrections_version = self._UNSET
+        self._corrections_rows = 0
+        self._result: Optional[Tuple[Dict, pd.DataFrame]] = None
+
+    def refresh(self, constraints_df: Optional[pd.DataFrame], logic_df: Optional[pd.DataFrame],
+                corrections: Optional[pd.DataFrame], corrections_version) -> Tuple[Dict, pd.DataFrame]:
+        """Apply whatever changed since the last call and return (analysis, enumerator metrics)"""
+        frames = {'constraint': constraints_df, 'logic': logic_df}
+
+        with self._lock:
+            changed = False
+            for category, label in self.CATEGORIES:
+                changed |= self._update_errors(category, label, frames[category])
+            changed |= self._update_corrections(corrections, corrections_version)
+
+            if changed or self._result is None:
+                self._result = self._build()
+            return self._result
+
+    @staticmethod
+    def _apply_delta(counts: pd.Series, added: pd.Series, removed: pd.Series) -> pd.Series:
+        counts = counts.add(added.value_counts(), fill_value=0).sub(removed.value_counts(), fill_value=0)
+        return counts[counts > 0].astype('int64')
+
+    @staticmethod
+    def _row_keys(df: pd.DataFrame) -> pd.MultiIndex:
+        hashes = pd.util.hash_pandas_object(df, index=False)
+        occurrence = hashes.groupby(hashes, sort=False).cumcount()
+        return pd.MultiIndex.from_arrays([hashes.to_numpy(), occurrence.to_numpy()], names=['hash', 'occurrence'])
+
+    def _update_errors(self, category: str, label: str, df: Optional[pd.DataFrame]) -> bool:
+        version = df.attrs.get('source_version') if df is not None else None
+        if category in self._versions and self._versions[category] == version and (version is not None or df is None):
+            return False
+        self._versions[category] = version
+
+        if df is None or len(df) == 0:
+            df = pd.DataFrame(columns=['username', 'variable'])
+
+        old_rows = self._rows.get(category)
+        if old_rows is None:
+            old_rows = pd.DataFrame(
+                columns=['username', 'variable', 'farmer'],
+                index=pd.MultiIndex.from_arrays([[], []], names=['hash', 'occurrence'])
+            )
+
+        keys = self._row_keys(df)
+        is_new = ~keys.isin(old_rows.index)
+        is_kept = old_rows.index.isin(keys)
+
+        new_errors = df[is_new].set_axis(keys[is_new])
+        id_col = get_unique_id_column(new_errors)
+        added = pd.DataFrame({
+            'username': new_errors['username'] if 'username' in new_errors.columns else None,
+            'variable': new_errors['variable'],
+            'farmer': new_errors[id_col] if id_col else None
+        }, index=new_errors.index)
+        removed = old_rows[~is_kept]
+
+        self._rows[category] = concat_frames([old_rows[is_kept], added], ignore_index=False) if len(added) > 0 else old_rows[is_kept]
+
+        self._enumerator_counts[category] = self._apply_delta(
+            self._enumerator_counts.get(category, pd.Series(dtype='int64')), added['username'], removed['username']
+        )
+        self._variable_counts[category] = self._apply_delta(
+            self._variable_counts.get(category, pd.Series(dtype='int64')), added['variable'], removed['variable']
+        )
+        self._farmer_counts = self._apply_delta(self._farmer_counts, added['farmer'], removed['farmer'])
+
+        strange = self._strange.get(category)
+        if strange is not None and len(strange) > 0:
+            strange = strange[strange.index.isin(keys)]
+        found = detect_strange_values(new_errors.assign(error_category=label))
+        parts = [part for part in (strange, found) if part is not None and len(part) > 0]
+        self._strange[category] = pd.concat(parts) if parts else pd.DataFrame()
+
+        return True
+
+    def _update_corrections(self, corrections: Optional[pd.DataFrame], version) -> bool:
+        if self._corrections_version is not self._UNSET and version == self._corrections_version \
+                and (version is not None or corrections is None):
+            return False
+
+        known = self._corrections_version
+        if known is not self._UNSET and known and version and version[:len(known)] == known:
+            # Only shards were appended: count just the rows they added
+            new_rows = corrections.iloc[self._corrections_rows:]
+        else:
+            self._solved = pd.Series(dtype='int64')
+            new_rows = corrections
+
+        if new_rows is not None and 'corrected_by' in new_rows.columns:
+            self._solved = self._solved.add(new_rows['corrected_by'].value_counts(), fill_value=0).astype('int64')
+
+        self._corrections_version = version
+        self._corrections_rows = len(corrections) if corrections is not None else 0
+
+        return True
+
+    def _build(self) -> Tuple[Dict, pd.DataFrame]:
+        analysis = {
+            'error_type_overview': {},
+            'error_rate_by_enumerator': [],
+            'enumerators_without_errors': [],
+            'most_common_variables': {},
+            'strange_values': [],
+            'overall_stats': {}
+        }
+
+        empty = pd.Series(dtype='int64')
+        constraint_counts = self._enumerator_counts.get('constraint', empty)
+        logic_counts = self._enumerator_counts.get('logic', empty)
+        metrics = build_enumerator_metrics(constraint_counts, logic_counts, self._solved)
+
+        total_constraint = len(self._rows['constraint']) if 'constraint' in self._rows else 0
+        total_logic = len(self._rows['logic']) if 'logic' in self._rows else 0
+        total_errors = total_constraint + total_logic
+
+        if total_errors == 0:
+            return analysis, metrics
+
+        analysis['error_type_overview'] = {
+            'Total Constraint Errors': total_constraint,
+            'Total Logic Errors': total_logic,
+            'Total Errors': total_errors,
+            'Unique Farmers Affected': len(self._farmer_counts)
+        }
+
+        enumerator_analysis = metrics[metrics['Total Errors'] > 0][[
+            'Username', 'Constraint Errors', 'Logic Errors', 'Total Errors',
+            'Solved', 'Remaining', 'Error Rate (%)', 'Completion Rate (%)'
+        ]]
+
+        analysis['error_rate_by_enumerator'] = enumerator_analysis.sort_values('Total Errors', ascending=False)
+
+        enumerators_with_errors = set(constraint_counts.index) | set(logic_counts.index)
+        analysis['enumerators_without_errors'] = [e for e in VALID_ENUMERATORS if e not in enumerators_with_errors]
+
+        variable_counts = pd.concat([
+            self._variable_counts.get(category, empty).rename_axis('variable').reset_index(name='count')
+                .assign(error_category=label)
+            for category, label in self.CATEGORIES
+        ], ignore_index=True)[['variable', 'error_category', 'count']]
+        variable_counts = variable_counts.sort_values('count', ascending=False)
+
+        analysis['most_common_variables'] = {
+            'top_constraint_variables': variable_counts[variable_counts['error_category'] == 'Constraint'].head(10),
+            'top_logic_variables': variable_counts[variable_counts['error_category'] == 'Logic'].head(10),
+            'overall_top_variables': variable_counts.head(15)
+        }
+
+        strange_parts = [self._strange[category] for category, _ in self.CATEGORIES
+                         if len(self._strange.get(category, ())) > 0]
+        strange_values = pd.concat(strange_parts, ignore_index=True) if strange_parts else pd.DataFrame()
+
+        analysis['strange_values'] = strange_values
+
+        enumerators_with_errors_count = len(enumerators_with_errors)
+        analysis['overall_stats'] = {
+            'Total Enumerators': len(VALID_ENUMERATORS),
+            'Enumerators with Errors': enumerators_with_errors_count,
+            'Enumerators without Errors': len(analysis['enumerators_without_errors']),
+            'Average Errors per Enumerator': round(total_errors / enumerators_with_errors_count, 2) if enumerators_with_errors_count > 0 else 0,
+            'Unique Variables with Errors': variable_counts['variable'].nunique(),
+            'Strange Values Detected': len(strange_values)
+        }
+
+        return analysis, metrics
+
+@st.cache_resource
+def get_error_analytics() -> ErrorAnalytics:
+    """Process-wide dashboard aggregates, shared by all admin sessions"""
+    return ErrorAnalytics()
+
+def refresh_error_analytics(constraints_df: pd.DataFrame, logic_df: pd.DataFrame) -> Tuple[Dict, pd.DataFrame]:
+    """Bring the shared aggregates up to date and return (analysis, enumerator metrics)"""
+    corrections, corrections_version = load_corrections_with_version()
+    return get_error_analytics().refresh(constraints_df, logic_df, corrections, corrections_version)
+
+def get_comprehensive_error_analysis(constraints_df: pd.DataFrame, logic_df: pd.DataFrame) -> Dict:
+    """Generate comprehensive error analysis summary"""
+    return refresh_error_analytics(constraints_df, logic_df)[0]
 
 # ============================================================================
 # VALIDATION FUNCTIONS
@@ -697,22 +1948,22 @@ def get_comprehensive_error_analysis(constraints_df: pd.DataFrame, logic_df: pd.
 
 def validate_corrections() -> Tuple[bool, List[str], int, int]:
     """Validate all corrections are complete with explanations"""
-    total_errors = len(st.session_state.all_corrections_data)
+    total_errors = len(st.session_state.drafts)
     completed = 0
     missing = []
     
-    for error_key, correction_data in st.session_state.all_corrections_data.items():
+    for error_key, correction_data in st.session_state.drafts.items():
         explanation = correction_data.get('explanation', '').strip()
         
         if not explanation:
-            var_name = correction_data['error_data']['variable']
+            var_name = correction_data['variable']
             error_type = "Constraint" if correction_data['error_type'] == 'constraint' else "Logic"
             missing.append(f"{error_type}: {var_name} - No explanation provided")
             continue
         
         if correction_data.get('outside_range', False):
             if len(explanation) < 20:
-                var_name = correction_data['error_data']['variable']
+                var_name = correction_data['variable']
                 error_type = "Constraint" if correction_data['error_type'] == 'constraint' else "Logic"
                 missing.append(f"{error_type}: {var_name} - Out-of-range value needs detailed explanation (min 20 chars)")
                 continue
@@ -723,13 +1974,7 @@ def validate_corrections() -> Tuple[bool, List[str], int, int]:
 
 def validate_farmer_corrections(farmer_id: str) -> Tuple[bool, List[str], int, int]:
     """Validate corrections for a specific farmer"""
-    farmer_corrections = {}
-    
-    for k, v in st.session_state.all_corrections_data.items():
-        id_col = v.get('id_column', 'unique_id')
-        farmer_id_val = v['error_data'].get(id_col)
-        if str(farmer_id_val) == str(farmer_id):
-            farmer_corrections[k] = v
+    farmer_corrections = st.session_state.drafts.for_farmer(farmer_id)
     
     total_errors = len(farmer_corrections)
     completed = 0
@@ -739,14 +1984,14 @@ def validate_farmer_corrections(farmer_id: str) -> Tuple[bool, List[str], int, i
         explanation = correction_data.get('explanation', '').strip()
         
         if not explanation:
-            var_name = correction_data['error_data']['variable']
+            var_name = correction_data['variable']
             error_type = "Constraint" if correction_data['error_type'] == 'constraint' else "Logic"
             missing.append(f"{error_type}: {var_name}")
             continue
         
         if correction_data.get('outside_range', False):
             if len(explanation) < 20:
-                var_name = correction_data['error_data']['variable']
+                var_name = correction_data['variable']
                 missing.append(f"{var_name} - Needs detailed explanation")
                 continue
         
@@ -754,10 +1999,89 @@ def validate_farmer_corrections(farmer_id: str) -> Tuple[bool, List[str], int, i
     
     return completed == total_errors, missing, completed, total_errors
 
+@st.cache_data(max_entries=4)
+def validate_saved_corrections(_corrections: Optional[pd.DataFrame], corrections_version) -> Dict:
+    """Re-check saved corrections against their rules in one vectorized pass (cached per corrections version).
+
+    Only rows whose rule declares a min, max or between limit are checked;
+    the rest are counted as unchecked. Limits come from the same compiled
+    rules as the form, but the form only flags limits that differ from the
+    defaults, so a violation need not have been flagged when saved.
+    """
+    result = {
+        'checked': 0,
+        'unchecked': 0,
+        'violations': pd.DataFrame(),
+        'by_enumerator': pd.DataFrame(),
+        'by_variable': pd.DataFrame()
+    }
+    
+    if _corrections is None or len(_corrections) == 0 or 'correct_value' not in _corrections.columns:
+        return result
+    
+    if 'reference_value' in _corrections.columns:
+        rule_texts = _corrections['reference_value']
+    else:
+        rule_texts = pd.Series(None, index=_corrections.index, dtype=object)
+    
+    # Compile each distinct rule once, then broadcast its limits to every row
+    table = build_rule_table(rule_texts)
+    rules = pd.DataFrame(list(table.values()), index=list(table.keys()), columns=list(ConstraintRule._fields))
+    min_vals = rule_texts.map(rules['min_val'])
+    max_vals = rule_texts.map(rules['max_val'])
+    # Rules without an operator only carry the default limits, which bound nothing
+    checked = rule_texts.map(rules['operator']).notna()
+    
+    values = pd.to_numeric(_corrections['correct_value'], errors='coerce')
+    issue = pd.Series('', index=_corrections.index, dtype=object)
+    issue = issue.mask(values.isna(), 'Not a Number')
+    issue = issue.mask(values < min_vals, 'Below Minimum')
+    issue = issue.mask(values > max_vals, 'Above Maximum')
+    violated = checked & (issue != '')
+    
+    def column(name: str):
+        return _corrections[name] if name in _corrections.columns else 'N/A'
+    
+    violations = pd.DataFrame({
+        'Enumerator': column('corrected_by'),
+        'Variable': column('variable'),
+        'Farmer ID': column('unique_id'),
+        'Correct Value': _corrections['correct_value'],
+        'Min': min_vals,
+        'Max': max_vals,
+        'Rule': rule_texts,
+        'Issue': issue,
+        'Flagged When Saved': column('outside_range')
+    })[violated]
+    
+    def summarize(by: str, label: str) -> pd.DataFrame:
+        if by not in _corrections.columns:
+            return pd.DataFrame()
+        
+        summary = pd.DataFrame({
+            'Checked': checked.groupby(_corrections[by], observed=True).sum(),
+            'Violations': violated.groupby(_corrections[by], observed=True).sum()
+        })
+        summary['Violation Rate (%)'] = (summary['Violations'] / summary['Checked'] * 100).round(1)
+        summary = summary.rename_axis(label).reset_index()
+        
+        return summary[summary['Violations'] > 0].sort_values('Violations', ascending=False)
+    
+    result['checked'] = int(checked.sum())
+    result['unchecked'] = len(_corrections) - result['checked']
+    result['violations'] = violations.reset_index(drop=True)
+    result['by_enumerator'] = summarize('corrected_by', 'Username')
+    result['by_variable'] = summarize('variable', 'Variable')
+    
+    return result
+
 # ============================================================================
 # UI COMPONENTS
 # ============================================================================
 
+# st.fragment only exists in newer Streamlit releases; older ones rerun the whole page
+fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None) or (lambda func: func)
+
 def render_progress_bar(current: int, total: int):
     """Render a visual progress bar"""
     percentage = (current / total * 100) if total > 0 else 0
@@ -821,11 +2145,17 @@ def render_farmer_header(farmer_name: str, phone_no: str, woreda: str, kebele: s
         </div>
     """, unsafe_allow_html=True)
 
-def render_constraint_error(error: pd.Series, error_key: str, id_col: str):
+def restore_widget_state(key: str, value):
+    """Seed a widget from its draft; Streamlit drops the state of widgets not drawn in a run"""
+    if key not in st.session_state:
+        st.session_state[key] = value
+
+def render_constraint_error(error: pd.Series, error_key: str, id_col: str, source: pd.DataFrame,
+                            schema: Optional[Dict[str, Optional[str]]] = None):
     """Render constraint error correction form"""
     st.markdown(f"### 🔒 {error['variable']}")
     
-    reason_col = get_reason_column(pd.DataFrame([error]))
+    reason_col = (schema or get_row_schema(error))['reason']
     constraint_text = error.get(reason_col, error.get('constraint', 'No constraint specified')) if reason_col else error.get('constraint', 'No constraint specified')
     
     min_val, max_val = extract_constraint_limits(str(constraint_text))
@@ -843,10 +2173,12 @@ def render_constraint_error(error: pd.Series, error_key: str, id_col: str):
         if min_val != 0 or max_val != 100000:
             st.caption(f"💡 Expected range: {min_val} - {max_val}")
     
+    draft = st.session_state.drafts.get(error_key)
+    
     with col2:
+        restore_widget_state(f"value_{error_key}", draft['correct_value'] if draft else default_value)
         correct_value = st.number_input(
             "Corrected Value",
-            value=default_value,
             step=1,
             key=f"value_{error_key}",
             help="Enter the actual correct value (no restrictions)"
@@ -858,6 +2190,7 @@ def render_constraint_error(error: pd.Series, error_key: str, id_col: str):
             st.warning(f"⚠️ Value is outside expected range ({min_val}-{max_val}). Please explain why in detail below.")
             outside_range = True
     
+    restore_widget_state(f"explain_{error_key}", draft['explanation'] if draft else "")
     explanation = st.text_area(
         "📝 Explanation (Required)",
         placeholder="Why is this correction needed? What did the farmer say? If outside expected range, provide detailed justification.",
@@ -866,14 +2199,18 @@ def render_constraint_error(error: pd.Series, error_key: str, id_col: str):
         help="Please provide a clear explanation for the correction"
     )
     
-    st.session_state.all_corrections_data[error_key] = {
+    # error.name is the row's label in source, so the draft need not copy the row
+    st.session_state.drafts.put(error_key, {
         'error_type': 'constraint',
-        'error_data': error,
+        'source': source,
+        'label': error.name,
+        'farmer_id': str(error.get(id_col)),
+        'variable': str(error.get('variable')),
         'correct_value': correct_value,
         'explanation': explanation,
         'outside_range': outside_range,
         'id_column': id_col
-    }
+    })
     
     if explanation and explanation.strip():
         if outside_range and len(explanation.strip()) < 20:
@@ -883,11 +2220,12 @@ def render_constraint_error(error: pd.Series, error_key: str, id_col: str):
     else:
         st.error("❌ Explanation required before saving")
 
-def render_logic_error(error: pd.Series, error_key: str, id_col: str):
+def render_logic_error(error: pd.Series, error_key: str, id_col: str, source: pd.DataFrame,
+                       schema: Optional[Dict[str, Optional[str]]] = None):
     """Render logic error correction form"""
     st.markdown(f"### 📊 {error['variable']}")
     
-    reason_col = get_reason_column(pd.DataFrame([error]))
+    reason_col = (schema or get_row_schema(error))['reason']
     reason_text = error.get(reason_col, error.get('reason', 'No reason specified')) if reason_col else error.get('reason', 'No reason specified')
     
     try:
@@ -905,10 +2243,12 @@ def render_logic_error(error: pd.Series, error_key: str, id_col: str):
         if min_val != 0 or max_val != 100000:
             st.caption(f"💡 Expected range: {min_val} - {max_val}")
     
+    draft = st.session_state.drafts.get(error_key)
+    
     with col2:
+        restore_widget_state(f"value_{error_key}", draft['correct_value'] if draft else current_value)
         correct_value = st.number_input(
             "Corrected Value",
-            value=current_value,
             step=1,
             key=f"value_{error_key}",
             help="Enter the actual correct value after verification (no restrictions)"
@@ -920,6 +2260,7 @@ def render_logic_error(error: pd.Series, error_key: str, id_col: str):
             st.warning(f"⚠️ Value is outside expected range ({min_val}-{max_val}). Please explain why in detail below.")
             outside_range = True
     
+    restore_widget_state(f"explain_{error_key}", draft['explanation'] if draft else "")
     explanation = st.text_area(
         "📝 Explanation (Required)",
         placeholder="Why is this the correct value? What did you verify with the farmer?",
@@ -927,14 +2268,18 @@ def render_logic_error(error: pd.Series, error_key: str, id_col: str):
         height=120
     )
     
-    st.session_state.all_corrections_data[error_key] = {
+    # error.name is the row's label in source, so the draft need not copy the row
+    st.session_state.drafts.put(error_key, {
         'error_type': 'logic',
-        'error_data': error,
+        'source': source,
+        'label': error.name,
+        'farmer_id': str(error.get(id_col)),
+        'variable': str(error.get('variable')),
         'correct_value': correct_value,
         'explanation': explanation,
         'outside_range': outside_range,
         'id_column': id_col
-    }
+    })
     
     if explanation and explanation.strip():
         if outside_range and len(explanation.strip()) < 20:
@@ -948,63 +2293,76 @@ def render_logic_error(error: pd.Series, error_key: str, id_col: str):
 # SAVE FUNCTIONS
 # ============================================================================
 
+def build_correction_records(pending: List[Dict], selected_enumerator: str) -> pd.DataFrame:
+    """Build the saved rows for a batch of pending corrections in one columnar pass.
+
+    Drafts are grouped by the error frame their rows live in, so each group's
+    rows are taken with one .loc and its field names are resolved once. Every
+    row in the batch shares one timestamp.
+    """
+    now = datetime.now()
+    
+    sources = {}
+    groups: Dict[Tuple, List[int]] = {}
+    for position, correction_data in enumerate(pending):
+        source = correction_data['source']
+        sources[id(source)] = source
+        key = (id(source), correction_data.get('id_column', 'unique_id'))
+        groups.setdefault(key, []).append(position)
+    
+    def first_column(errors: pd.DataFrame, candidates: List[Optional[str]]):
+        for col in candidates:
+            if col and col in errors.columns:
+                return errors[col]
+        return ''
+    
+    frames = []
+    for (source_id, id_col), positions in groups.items():
+        batch = [pending[i] for i in positions]
+        source = sources[source_id]
+        errors = source.loc[[correction_data['label'] for correction_data in batch]].set_axis(positions)
+        schema = get_schema(source)
+        
+        frames.append(pd.DataFrame({
+            'error_type': [correction_data['error_type'] for correction_data in batch],
+            'username': first_column(errors, ['username']),
+            'woreda': first_column(errors, ['woreda']),
+            'kebele': first_column(errors, ['kebele']),
+            'village': first_column(errors, ['village']),
+            'farmer_name': first_column(errors, [schema['farmer_name']] if schema['farmer_name'] else ['resp_name', 'farmer_name']),
+            'phone_no': first_column(errors, [schema['phone']] if schema['phone'] else ['phone_no']),
+            'subdate': first_column(errors, [schema['date']] if schema['date'] else ['startdate', 'subdate']),
+            'unique_id': first_column(errors, [id_col]),
+            'variable': first_column(errors, ['variable']),
+            'original_value': first_column(errors, ['value']),
+            'correct_value': [correction_data['correct_value'] for correction_data in batch],
+            'explanation': [correction_data['explanation'] for correction_data in batch],
+            'corrected_by': selected_enumerator,
+            'correction_date': now.strftime("%d-%b-%y"),
+            'correction_timestamp': now.isoformat(),
+            'outside_range': [correction_data.get('outside_range', False) for correction_data in batch],
+            'reference_value': first_column(errors, [schema['reason']] if schema['reason'] else ['reason', 'constraint'])
+        }, index=positions))
+    
+    if not frames:
+        return pd.DataFrame()
+    
+    return pd.concat(frames).sort_index().reset_index(drop=True)
+
 def save_farmer_corrections(farmer_id: str, selected_enumerator: str) -> bool:
     """Save corrections for a specific farmer"""
-    farmer_corrections = {}
-    for k, v in st.session_state.all_corrections_data.items():
-        id_col = v.get('id_column', 'unique_id')
-        if str(v['error_data'].get(id_col)) == str(farmer_id):
-            farmer_corrections[k] = v
+    farmer_corrections = st.session_state.drafts.for_farmer(farmer_id)
     
     if not farmer_corrections:
         return False
     
-    corrections = []
-    
-    for error_key, correction_data in farmer_corrections.items():
-        error_data = correction_data['error_data']
-        id_col = correction_data.get('id_column', 'unique_id')
-        
-        farmer_name_col = get_farmer_name_column(pd.DataFrame([error_data]))
-        phone_col = get_phone_column(pd.DataFrame([error_data]))
-        date_col = get_date_column(pd.DataFrame([error_data]))
-        reason_col = get_reason_column(pd.DataFrame([error_data]))
-        
-        base_record = {
-            'error_type': correction_data['error_type'],
-            'username': error_data.get('username', ''),
-            'woreda': error_data.get('woreda', ''),
-            'kebele': error_data.get('kebele', ''),
-            'village': error_data.get('village', ''),
-            'farmer_name': error_data.get(farmer_name_col, '') if farmer_name_col else error_data.get('resp_name', error_data.get('farmer_name', '')),
-            'phone_no': error_data.get(phone_col, '') if phone_col else error_data.get('phone_no', ''),
-            'subdate': error_data.get(date_col, '') if date_col else error_data.get('startdate', error_data.get('subdate', '')),
-            'unique_id': error_data.get(id_col, ''),
-            'variable': error_data.get('variable', ''),
-            'original_value': error_data.get('value', ''),
-            'correct_value': correction_data['correct_value'],
-            'explanation': correction_data['explanation'],
-            'corrected_by': selected_enumerator,
-            'correction_date': datetime.now().strftime("%d-%b-%y"),
-            'correction_timestamp': datetime.now().isoformat(),
-            'outside_range': correction_data.get('outside_range', False)
-        }
-        
-        if reason_col:
-            base_record['reference_value'] = error_data.get(reason_col, '')
-        else:
-            base_record['reference_value'] = error_data.get('reason', error_data.get('constraint', ''))
-        
-        corrections.append(base_record)
+    corrections_df = build_correction_records(list(farmer_corrections.values()), selected_enumerator)
     
-    if corrections:
-        corrections_df = pd.DataFrame(corrections)
-        
+    if len(corrections_df) > 0:
         if save_corrections_to_github(corrections_df):
-            for error_key in farmer_corrections.keys():
-                st.session_state.corrected_errors.add(error_key)
-                if error_key in st.session_state.all_corrections_data:
-                    del st.session_state.all_corrections_data[error_key]
+            for error_key, correction_data in farmer_corrections.items():
+                st.session_state.corrected_errors.add(get_correction_key(correction_data))
+                st.session_state.drafts.remove(error_key)
             return True
     
     return False
@@ -1102,8 +2460,21 @@ def render_admin_dashboard(constraints_df: pd.DataFrame, logic_df: pd.DataFrame)
             st.session_state.is_authenticated = False
             st.rerun()
     
+    # Only the selected section is computed and drawn
+    section = st.radio(
+        "Section",
+        options=list(ADMIN_SECTIONS),
+        horizontal=True,
+        key="admin_section",
+        label_visibility="collapsed"
+    )
+    
     st.markdown("---")
     
+    ADMIN_SECTIONS[section](constraints_df, logic_df)
+
+def render_admin_summary(constraints_df: pd.DataFrame, logic_df: pd.DataFrame):
+    """Render the error overview, per-enumerator error rates and overall statistics"""
     st.header("📈 High Frequency Check Summary")
     
     with st.spinner("Generating comprehensive analysis..."):
@@ -1174,6 +2545,42 @@ def render_admin_dashboard(constraints_df: pd.DataFrame, logic_df: pd.DataFrame)
     
     st.markdown("---")
     
+    st.subheader("📊 Overall Statistics")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric(
+            "Enumerators with Errors",
+            analysis['overall_stats']['Enumerators with Errors'],
+            delta=f"{analysis['overall_stats']['Enumerators without Errors']} clean"
+        )
+    
+    with col2:
+        st.metric(
+            "Avg Errors/Enumerator",
+            analysis['overall_stats']['Average Errors per Enumerator']
+        )
+    
+    with col3:
+        st.metric(
+            "Unique Variables",
+            analysis['overall_stats']['Unique Variables with Errors']
+        )
+    
+    with col4:
+        st.metric(
+            "Strange Values",
+            analysis['overall_stats']['Strange Values Detected'],
+            delta="Need review" if analysis['overall_stats']['Strange Values Detected'] > 0 else "All good",
+            delta_color="inverse"
+        )
+
+@fragment
+def render_admin_variables(constraints_df: pd.DataFrame, logic_df: pd.DataFrame):
+    """Render the most frequent variable errors and the outlier values"""
+    analysis = get_comprehensive_error_analysis(constraints_df, logic_df)
+    
     st.subheader("🔍 Most Frequent Variable Errors")
     
     tab1, tab2, tab3 = st.tabs(["📊 Overall", "🔒 Constraints", "📈 Logic"])
@@ -1236,42 +2643,10 @@ def render_admin_dashboard(constraints_df: pd.DataFrame, logic_df: pd.DataFrame)
         )
     else:
         st.success("✅ No suspicious outlier values detected")
-    
-    st.markdown("---")
-    
-    st.subheader("📊 Overall Statistics")
-    
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.metric(
-            "Enumerators with Errors",
-            analysis['overall_stats']['Enumerators with Errors'],
-            delta=f"{analysis['overall_stats']['Enumerators without Errors']} clean"
-        )
-    
-    with col2:
-        st.metric(
-            "Avg Errors/Enumerator",
-            analysis['overall_stats']['Average Errors per Enumerator']
-        )
-    
-    with col3:
-        st.metric(
-            "Unique Variables",
-            analysis['overall_stats']['Unique Variables with Errors']
-        )
-    
-    with col4:
-        st.metric(
-            "Strange Values",
-            analysis['overall_stats']['Strange Values Detected'],
-            delta="Need review" if analysis['overall_stats']['Strange Values Detected'] > 0 else "All good",
-            delta_color="inverse"
-        )
-    
-    st.markdown("---")
-    
+
+@fragment
+def render_admin_progress(constraints_df: pd.DataFrame, logic_df: pd.DataFrame):
+    """Render overall and per-enumerator correction progress"""
     stats_df = get_enumerator_statistics(constraints_df, logic_df)
     
     total_errors = stats_df['Total Errors'].sum()
@@ -1323,19 +2698,48 @@ def render_admin_dashboard(constraints_df: pd.DataFrame, logic_df: pd.DataFrame)
                 st.metric("Progress", f"{row['Progress (%)']}%")
             
             render_progress_bar(row['Solved'], row['Total Errors'])
+
+def render_admin_corrections_check(constraints_df: pd.DataFrame, logic_df: pd.DataFrame):
+    """Render the re-validation of saved corrections against their rules"""
+    st.subheader("🧪 Saved Corrections Check")
+    
+    corrections, corrections_version = load_corrections_with_version()
+    quality = validate_saved_corrections(corrections, corrections_version)
+    
+    if quality['checked'] + quality['unchecked'] == 0:
+        st.info("📭 No corrections submitted yet.")
+    elif quality['checked'] == 0:
+        st.info("ℹ️ No saved correction has a min, max or between rule to check against.")
+    elif quality['violations'].empty:
+        st.success(f"✅ All {quality['checked']} saved corrections are within their rule limits")
+    else:
+        st.warning(f"⚠️ {len(quality['violations'])} of {quality['checked']} saved corrections are outside their rule limits")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("**By Enumerator**")
+            st.dataframe(quality['by_enumerator'], use_container_width=True)
+        
+        with col2:
+            st.markdown("**By Variable**")
+            st.dataframe(quality['by_variable'], use_container_width=True)
+        
+        with st.expander("See corrections outside their rule limits"):
+            st.dataframe(quality['violations'], use_container_width=True)
     
-    st.markdown("---")
-    
+    if quality['unchecked'] > 0:
+        st.caption(f"{quality['unchecked']} saved corrections have no min, max or between rule and were not checked")
+
+@fragment
+def render_admin_corrections(constraints_df: pd.DataFrame, logic_df: pd.DataFrame):
+    """Render the saved corrections with filters and downloads"""
     st.subheader("📋 All Corrections")
     
     try:
-        headers = get_github_headers()
-        corrections_url = f"https://api.github.com/repos/{GITHUB_OWNER}/{GITHUB_REPO}/contents/{CORRECTIONS_FILE}"
-        response = requests.get(corrections_url, headers=headers)
+        all_corrections, corrections_version = load_corrections_with_version()
         
-        if response.status_code == 200:
-            corrections_content = base64.b64decode(response.json()['content']).decode('utf-8')
-            all_corrections = pd.read_csv(io.StringIO(corrections_content))
+        if all_corrections is not None:
             
             filter_col1, filter_col2, filter_col3 = st.columns(3)
             
@@ -1356,7 +2760,7 @@ def render_admin_dashboard(constraints_df: pd.DataFrame, logic_df: pd.DataFrame)
             with filter_col3:
                 show_flagged = st.checkbox("Show flagged corrections only", value=False)
             
-            filtered_df = all_corrections.copy()
+            filtered_df = all_corrections
             if selected_enumerator:
                 filtered_df = filtered_df[filtered_df['corrected_by'].isin(selected_enumerator)]
             if selected_error_type:
@@ -1380,37 +2784,50 @@ def render_admin_dashboard(constraints_df: pd.DataFrame, logic_df: pd.DataFrame)
             st.markdown("---")
             st.subheader("💾 Download Data")
             
+            export_format = st.radio("Format", options=list(EXPORT_FORMATS), horizontal=True, key="export_format")
+            extension, mime = EXPORT_FORMATS[export_format]
+            
+            stats_key = (
+                corrections_version,
+                constraints_df.attrs.get('source_version') if constraints_df is not None else None,
+                logic_df.attrs.get('source_version') if logic_df is not None else None
+            )
+            filter_key = (corrections_version, tuple(selected_enumerator), tuple(selected_error_type), show_flagged)
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M')
+            
+            # Each file is encoded only in the run its own button is pressed (and
+            # reused from the export cache until the data changes)
             col1, col2, col3 = st.columns(3)
             
             with col1:
-                csv = filtered_df.to_csv(index=False)
-                st.download_button(
-                    label="📥 Download Filtered Data",
-                    data=csv,
-                    file_name=f"corrections_papaya_filtered_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
-                    mime='text/csv',
-                    use_container_width=True
-                )
+                if st.button("📦 Prepare Filtered Data", use_container_width=True):
+                    st.download_button(
+                        label="📥 Download Filtered Data",
+                        data=export_frame(filtered_df, filter_key, export_format),
+                        file_name=f"corrections_papaya_filtered_{timestamp}.{extension}",
+                        mime=mime,
+                        use_container_width=True
+                    )
             
             with col2:
-                csv_all = all_corrections.to_csv(index=False)
-                st.download_button(
-                    label="📥 Download All Corrections",
-                    data=csv_all,
-                    file_name=f"corrections_papaya_all_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
-                    mime='text/csv',
-                    use_container_width=True
-                )
+                if st.button("📦 Prepare All Corrections", use_container_width=True):
+                    st.download_button(
+                        label="📥 Download All Corrections",
+                        data=export_frame(all_corrections, (corrections_version,), export_format),
+                        file_name=f"corrections_papaya_all_{timestamp}.{extension}",
+                        mime=mime,
+                        use_container_width=True
+                    )
             
             with col3:
-                stats_csv = stats_df.to_csv(index=False)
-                st.download_button(
-                    label="📥 Download Statistics",
-                    data=stats_csv,
-                    file_name=f"enumerator_stats_papaya_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
-                    mime='text/csv',
-                    use_container_width=True
-                )
+                if st.button("📦 Prepare Statistics", use_container_width=True):
+                    st.download_button(
+                        label="📥 Download Statistics",
+                        data=export_frame(get_enumerator_statistics(constraints_df, logic_df), stats_key, export_format),
+                        file_name=f"enumerator_stats_papaya_{timestamp}.{extension}",
+                        mime=mime,
+                        use_container_width=True
+                    )
             
         else:
             st.info("📭 No corrections submitted yet.")
@@ -1418,10 +2835,80 @@ def render_admin_dashboard(constraints_df: pd.DataFrame, logic_df: pd.DataFrame)
     except Exception as e:
         st.error(f"Error loading corrections data: {str(e)}")
 
+# Dashboard sections in display order; each renders on its own when selected
+ADMIN_SECTIONS = {
+    "📈 Summary": render_admin_summary,
+    "🔍 Variables & Outliers": render_admin_variables,
+    "👥 Enumerator Progress": render_admin_progress,
+    "🧪 Corrections Check": render_admin_corrections_check,
+    "📋 All Corrections": render_admin_corrections
+}
+
 # ============================================================================
 # ENUMERATOR INTERFACE
 # ============================================================================
 
+@fragment
+def render_farmer_corrections(farmer_id, farmer: Dict, id_col: str, constraint_schema: Dict[str, Optional[str]],
+                              logic_schema: Dict[str, Optional[str]], selected_enumerator: str):
+    """Render one farmer's correction forms; editing them reruns only this block"""
+    farmer_constraint_errors = farmer['constraint_errors']
+    farmer_logic_errors = farmer['logic_errors']
+    total_farmer_errors = len(farmer_constraint_errors) + len(farmer_logic_errors)
+    
+    farmer_name = farmer['farmer_name']
+    phone_no = farmer['phone_no']
+    woreda = farmer['woreda']
+    kebele = farmer['kebele']
+    village = farmer['village']
+    
+    is_farmer_valid, farmer_missing, farmer_completed, farmer_total = validate_farmer_corrections(farmer_id)
+    
+    # Create expander title with location info
+    phone_display = format_display_value(phone_no)
+    woreda_display = format_display_value(woreda)
+    
+    with st.expander(f"👨‍🌾 {farmer_name} | 📍 {woreda_display} | 📞 {phone_display}", expanded=False):
+        render_farmer_header(farmer_name, phone_no, woreda, kebele, village, total_farmer_errors, farmer_completed)
+        
+        st.markdown("---")
+        
+        if len(farmer_constraint_errors) > 0:
+            st.markdown("#### 🔒 Constraint Errors")
+            for idx, error in farmer_constraint_errors.iterrows():
+                error_key = f"constraint_{error[id_col]}_{error['variable']}"
+                render_constraint_error(error, error_key, id_col, farmer['constraint_source'], constraint_schema)
+                st.markdown("---")
+        
+        if len(farmer_logic_errors) > 0:
+            st.markdown("#### 📊 Logic Errors")
+            for idx, error in farmer_logic_errors.iterrows():
+                error_key = f"logic_{error[id_col]}_{error['variable']}"
+                render_logic_error(error, error_key, id_col, farmer['logic_source'], logic_schema)
+                st.markdown("---")
+        
+        st.markdown("---")
+        
+        if is_farmer_valid:
+            if st.button(f"💾 Save Corrections for {farmer_name}", key=f"save_{farmer_id}", type="primary", use_container_width=True):
+                with st.spinner("Saving..."):
+                    if save_farmer_corrections(farmer_id, selected_enumerator):
+                        st.success(f"✅ Saved {farmer_completed} corrections for {farmer_name}!")
+                        st.balloons()
+                        load_data_from_github.clear()
+                        st.rerun()
+                    else:
+                        st.error("Failed to save. Please try again.")
+        else:
+            st.warning(f"⚠️ Complete all corrections for this farmer to save ({farmer_completed}/{farmer_total} ready)")
+            with st.expander("Missing items"):
+                for item in farmer_missing:
+                    st.write(f"• {item}")
+
+def change_farmer_page(step: int):
+    """Move the farmer list by step pages (button callback, runs before the rerun)"""
+    st.session_state.farmer_page += step
+
 def render_enumerator_interface(constraints_df: pd.DataFrame, logic_df: pd.DataFrame):
     """Render main enumerator correction interface"""
     
@@ -1450,34 +2937,23 @@ def render_enumerator_interface(constraints_df: pd.DataFrame, logic_df: pd.DataF
     
     id_col = constraint_id_col if constraint_id_col else logic_id_col
     
-    enumerator_constraints = filter_uncorrected_errors(
-        constraints_df[constraints_df['username'] == selected_enumerator] if constraints_df is not None else pd.DataFrame(),
-        'constraint',
-        selected_enumerator
-    )
-    
-    enumerator_logic = filter_uncorrected_errors(
-        logic_df[logic_df['username'] == selected_enumerator] if logic_df is not None else pd.DataFrame(),
-        'logic',
-        selected_enumerator
-    )
+    # Column layouts are resolved once per file, not per farmer or error
+    constraint_schema = get_schema(constraints_df)
+    logic_schema = get_schema(logic_df)
     
-    all_farmers_with_errors = sorted(
-        safe_get_unique_ids(enumerator_constraints) | 
-        safe_get_unique_ids(enumerator_logic)
+    workload = get_enumerator_workload(
+        selected_enumerator, constraints_df, logic_df, id_col, constraint_schema, logic_schema
     )
+    farmer_index = workload['farmers']
+    all_farmers_with_errors = workload['farmer_ids']
     
     if len(all_farmers_with_errors) == 0:
         st.success("🎉 All errors corrected! No pending issues.")
         st.balloons()
         return
     
-    total_errors = len(enumerator_constraints) + len(enumerator_logic)
-    
-    existing_corrections = load_existing_corrections()
-    saved_count = 0
-    if existing_corrections is not None:
-        saved_count = len(existing_corrections[existing_corrections['corrected_by'] == selected_enumerator])
+    total_errors = workload['total_errors']
+    saved_count = workload['saved_count']
     
     col1, col2, col3 = st.columns(3)
     
@@ -1501,96 +2977,60 @@ def render_enumerator_interface(constraints_df: pd.DataFrame, logic_df: pd.DataF
     st.subheader("📞 Call Farmers & Correct Errors")
     st.caption("Complete corrections for each farmer and save individually, or save all at once")
     
-    for farmer_id in all_farmers_with_errors:
-        farmer_constraint_errors = enumerator_constraints[
-            enumerator_constraints[id_col] == farmer_id
-        ] if len(enumerator_constraints) > 0 else pd.DataFrame()
-        
-        farmer_logic_errors = enumerator_logic[
-            enumerator_logic[id_col] == farmer_id
-        ] if len(enumerator_logic) > 0 else pd.DataFrame()
+    if error_filter == "Constraints Only":
+        listed_farmers = [f for f in all_farmers_with_errors if len(farmer_index[f]['constraint_errors']) > 0]
+    elif error_filter == "Logic Only":
+        listed_farmers = [f for f in all_farmers_with_errors if len(farmer_index[f]['logic_errors']) > 0]
+    else:
+        listed_farmers = all_farmers_with_errors
+    
+    # Only the current page's forms are built; drafts keep the other pages' values
+    page_count = max((len(listed_farmers) + FARMERS_PER_PAGE - 1) // FARMERS_PER_PAGE, 1)
+    page = min(max(st.session_state.farmer_page, 1), page_count)
+    st.session_state.farmer_page = page
+    
+    if page_count > 1:
+        col1, col2, col3 = st.columns([1, 2, 1])
         
-        if error_filter == "Constraints Only" and len(farmer_constraint_errors) == 0:
-            continue
-        if error_filter == "Logic Only" and len(farmer_logic_errors) == 0:
-            continue
+        with col1:
+            st.button("⬅️ Previous", disabled=(page == 1), use_container_width=True,
+                      on_click=change_farmer_page, args=(-1,))
+        with col3:
+            st.button("Next ➡️", disabled=(page == page_count), use_container_width=True,
+                      on_click=change_farmer_page, args=(1,))
+        with col2:
+            first = (page - 1) * FARMERS_PER_PAGE
+            st.markdown(
+                f"<p style='text-align: center;'>Page {page} of {page_count} · "
+                f"farmers {first + 1}-{min(first + FARMERS_PER_PAGE, len(listed_farmers))} of {len(listed_farmers)}</p>",
+                unsafe_allow_html=True
+            )
+    
+    page_farmers = listed_farmers[(page - 1) * FARMERS_PER_PAGE:page * FARMERS_PER_PAGE]
+    
+    for farmer_id in page_farmers:
+        farmer = farmer_index[farmer_id]
+        farmer_constraint_errors = farmer['constraint_errors']
+        farmer_logic_errors = farmer['logic_errors']
         
         total_farmer_errors = len(farmer_constraint_errors) + len(farmer_logic_errors)
         
         if total_farmer_errors > 0:
-            # Get farmer info dynamically
-            farmer_name = ""
-            phone_no = ""
-            woreda = ""
-            kebele = ""
-            village = ""
-            
-            sample_df = farmer_constraint_errors if len(farmer_constraint_errors) > 0 else farmer_logic_errors
-            if len(sample_df) > 0:
-                farmer_name_col = get_farmer_name_column(sample_df)
-                phone_col = get_phone_column(sample_df)
-                location_cols = get_location_columns(sample_df)
-                
-                farmer_name = sample_df.iloc[0].get(farmer_name_col, 'Unknown') if farmer_name_col else sample_df.iloc[0].get('resp_name', sample_df.iloc[0].get('farmer_name', 'Unknown'))
-                phone_no = sample_df.iloc[0].get(phone_col, 'N/A') if phone_col else sample_df.iloc[0].get('phone_no', 'N/A')
-                
-                # Get location info
-                woreda = sample_df.iloc[0].get(location_cols['woreda'], '') if location_cols['woreda'] else sample_df.iloc[0].get('woreda', '')
-                kebele = sample_df.iloc[0].get(location_cols['kebele'], '') if location_cols['kebele'] else sample_df.iloc[0].get('kebele', '')
-                village = sample_df.iloc[0].get(location_cols['village'], '') if location_cols['village'] else sample_df.iloc[0].get('village', '')
-            
-            is_farmer_valid, farmer_missing, farmer_completed, farmer_total = validate_farmer_corrections(farmer_id)
-            
-            # Create expander title with location info
-            phone_display = format_display_value(phone_no)
-            woreda_display = format_display_value(woreda)
-            
-            with st.expander(f"👨‍🌾 {farmer_name} | 📍 {woreda_display} | 📞 {phone_display}", expanded=False):
-                render_farmer_header(farmer_name, phone_no, woreda, kebele, village, total_farmer_errors, farmer_completed)
-                
-                st.markdown("---")
-                
-                if len(farmer_constraint_errors) > 0:
-                    st.markdown("#### 🔒 Constraint Errors")
-                    for idx, error in farmer_constraint_errors.iterrows():
-                        error_key = f"constraint_{error[id_col]}_{error['variable']}"
-                        render_constraint_error(error, error_key, id_col)
-                        st.markdown("---")
-                
-                if len(farmer_logic_errors) > 0:
-                    st.markdown("#### 📊 Logic Errors")
-                    for idx, error in farmer_logic_errors.iterrows():
-                        error_key = f"logic_{error[id_col]}_{error['variable']}"
-                        render_logic_error(error, error_key, id_col)
-                        st.markdown("---")
-                
-                st.markdown("---")
-                
-                if is_farmer_valid:
-                    if st.button(f"💾 Save Corrections for {farmer_name}", key=f"save_{farmer_id}", type="primary", use_container_width=True):
-                        with st.spinner("Saving..."):
-                            if save_farmer_corrections(farmer_id, selected_enumerator):
-                                st.success(f"✅ Saved {farmer_completed} corrections for {farmer_name}!")
-                                st.balloons()
-                                load_data_from_github.clear()
-                                st.rerun()
-                            else:
-                                st.error("Failed to save. Please try again.")
-                else:
-                    st.warning(f"⚠️ Complete all corrections for this farmer to save ({farmer_completed}/{farmer_total} ready)")
-                    with st.expander("Missing items"):
-                        for item in farmer_missing:
-                            st.write(f"• {item}")
+            render_farmer_corrections(farmer_id, farmer, id_col, constraint_schema, logic_schema, selected_enumerator)
     
     # Save all section
     st.markdown("---")
     st.header("💾 Save All Remaining Corrections")
     
     is_valid, missing_list, completed, total = validate_corrections()
+    
+    # Errors on pages not opened yet have no draft but still need correcting
+    total = max(total, total_errors)
+    is_valid = completed == total
     render_progress_bar(completed, total)
     
     if not is_valid:
-        st.warning(f"⚠️ Some corrections are incomplete ({len(missing_list)} items)")
+        st.warning(f"⚠️ Some corrections are incomplete ({total - completed} items)")
         with st.expander("See incomplete items"):
             for item in missing_list:
                 st.write(f"• {item}")
@@ -1602,10 +3042,9 @@ def render_enumerator_interface(constraints_df: pd.DataFrame, logic_df: pd.DataF
             st.error("No completed corrections to save")
             st.stop()
         
-        corrections = []
         keys_to_remove = []
         
-        for error_key, correction_data in st.session_state.all_corrections_data.items():
+        for error_key, correction_data in st.session_state.drafts.items():
             explanation = correction_data.get('explanation', '').strip()
             
             if not explanation:
@@ -1614,56 +3053,26 @@ def render_enumerator_interface(constraints_df: pd.DataFrame, logic_df: pd.DataF
             if correction_data.get('outside_range', False) and len(explanation) < 20:
                 continue
             
-            error_data = correction_data['error_data']
-            id_col = correction_data.get('id_column', 'unique_id')
-            
-            farmer_name_col = get_farmer_name_column(pd.DataFrame([error_data]))
-            phone_col = get_phone_column(pd.DataFrame([error_data]))
-            date_col = get_date_column(pd.DataFrame([error_data]))
-            reason_col = get_reason_column(pd.DataFrame([error_data]))
-            
-            base_record = {
-                'error_type': correction_data['error_type'],
-                'username': error_data.get('username', ''),
-                'woreda': error_data.get('woreda', ''),
-                'kebele': error_data.get('kebele', ''),
-                'village': error_data.get('village', ''),
-                'farmer_name': error_data.get(farmer_name_col, '') if farmer_name_col else error_data.get('resp_name', error_data.get('farmer_name', '')),
-                'phone_no': error_data.get(phone_col, '') if phone_col else error_data.get('phone_no', ''),
-                'subdate': error_data.get(date_col, '') if date_col else error_data.get('startdate', error_data.get('subdate', '')),
-                'unique_id': error_data.get(id_col, ''),
-                'variable': error_data.get('variable', ''),
-                'original_value': error_data.get('value', ''),
-                'correct_value': correction_data['correct_value'],
-                'explanation': correction_data['explanation'],
-                'corrected_by': selected_enumerator,
-                'correction_date': datetime.now().strftime("%d-%b-%y"),
-                'correction_timestamp': datetime.now().isoformat(),
-                'outside_range': correction_data.get('outside_range', False)
-            }
-            
-            if reason_col:
-                base_record['reference_value'] = error_data.get(reason_col, '')
-            else:
-                base_record['reference_value'] = error_data.get('reason', error_data.get('constraint', ''))
-            
-            corrections.append(base_record)
             keys_to_remove.append(error_key)
         
-        if corrections:
-            corrections_df = pd.DataFrame(corrections)
+        if keys_to_remove:
+            corrections_df = build_correction_records(
+                [st.session_state.drafts.get(error_key) for error_key in keys_to_remove],
+                selected_enumerator
+            )
             
             with st.spinner("Saving to secure repository..."):
                 if save_corrections_to_github(corrections_df):
-                    st.success(f"✅ Successfully saved {len(corrections)} corrections!")
+                    st.success(f"✅ Successfully saved {len(corrections_df)} corrections!")
                     if total - completed > 0:
                         st.info(f"📝 {total - completed} items still need attention and were not saved.")
                     st.balloons()
                     
                     for error_key in keys_to_remove:
-                        st.session_state.corrected_errors.add(error_key)
-                        if error_key in st.session_state.all_corrections_data:
-                            del st.session_state.all_corrections_data[error_key]
+                        st.session_state.corrected_errors.add(
+                            get_correction_key(st.session_state.drafts.get(error_key))
+                        )
+                        st.session_state.drafts.remove(error_key)
                     
                     load_data_from_github.clear()
                     st.rerun()